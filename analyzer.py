@@ -24,7 +24,7 @@ import telegram_bot
 
 # Import new ML and Mempool modules
 import ml_predictor
-from mempool_monitor import EarlySignal
+from mempool_monitor import EarlySignal, TransactionType
 
 # Globale Async Clients
 async_clients = []
@@ -281,9 +281,9 @@ class EnhancedAnalyzer:
                 
                 # Count large buys/sells
                 for tx in pending_txs:
-                    if tx.transaction_type.value == "LARGE_BUY":
+                    if tx.transaction_type == TransactionType.LARGE_BUY:
                         metrics.pending_large_buys += 1
-                    elif tx.transaction_type.value == "LARGE_SELL":
+                    elif tx.transaction_type == TransactionType.LARGE_SELL:
                         metrics.pending_large_sells += 1
                         
                 # Whale activity
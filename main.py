@@ -3,9 +3,15 @@
 Solana Ultra High-Performance Trading Bot v2.0
 Main Entry Point mit optimierter Startup-Sequenz
 """
+import sys
+
+# Python Version Check - vor allen anderen Imports
+if sys.version_info < (3, 10):
+    sys.stderr.write("❌ Python 3.10+ erforderlich!\n")
+    sys.exit(1)
+
 import asyncio
 import os
-import sys
 import signal
 import logging
 from dotenv import load_dotenv
@@ -13,22 +19,27 @@ from typing import Optional
 import time
 from telegram import Update
 
+# Lade Environment Variables einmalig, bevor Module ihre Config lesen
+load_dotenv(override=False)
+
 import telegram_bot
 from scanner import scanner
 from analyzer import analyzer
 from trader import trader
 
-# Logging Setup (MUST be before any logger usage!)
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('bot.log'),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger(__name__)
 
+def _configure_logging():
+    """Logging Setup - nur beim tatsächlichen Bot-Start (nicht beim Import)"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler('bot.log'),
+            logging.StreamHandler()
+        ]
+    )
+
 # Import Integration Layer (AI + Auto-Trading)
 try:
     from integration import initialize_integration, integration_manager
@@ -37,6 +48,17 @@ except ImportError:
     INTEGRATION_AVAILABLE = False
     logger.warning("⚠️ Integration module not available - running without AI")
 
+# Kritische Environment Variables: (Name, Beschreibung)
+_REQUIRED_VARS = (
+    ('PRIVATE_KEY', 'Wallet Private Key'),
+    ('TELEGRAM_BOT_TOKEN', 'Telegram Bot Token'),
+    ('TELEGRAM_CHAT_ID', 'Telegram Chat ID'),
+    ('RPC_URL', 'Solana RPC Endpoint'),
+)
+
+# Nur Update-Typen, die der Bot behandelt (Commands + Inline Buttons)
+_ALLOWED_UPDATES = [Update.MESSAGE, Update.CALLBACK_QUERY]
+
 class TradingBot:
     def __init__(self):
         self.scanner_task: Optional[asyncio.Task] = None
@@ -48,21 +70,13 @@ class TradingBot:
         """Initialisiert alle Bot-Komponenten"""
         logger.info("🚀 Initialisiere Solana Trading Bot v2.0...")
         
-        # Lade Environment Variables
-        load_dotenv()
-        
         # Validiere kritische Environment Variables
-        required_vars = {
-            'PRIVATE_KEY': 'Wallet Private Key',
-            'TELEGRAM_BOT_TOKEN': 'Telegram Bot Token',
-            'TELEGRAM_CHAT_ID': 'Telegram Chat ID',
-            'RPC_URL': 'Solana RPC Endpoint'
-        }
-        
-        missing_vars = []
-        for var, description in required_vars.items():
-            if not os.getenv(var):
-                missing_vars.append(f"  - {var}: {description}")
+        env = os.environ
+        missing_vars = [
+            f"  - {var}: {description}"
+            for var, description in _REQUIRED_VARS
+            if not env.get(var)
+        ]
                 
         if missing_vars:
             error_msg = "❌ Fehlende Environment Variables:\n" + "\n".join(missing_vars)
@@ -76,7 +90,7 @@ class TradingBot:
             self.telegram_app = telegram_bot.setup_bot()
             logger.info("✅ Telegram Bot initialisiert")
         except Exception as e:
-            logger.error(f"❌ Telegram Bot Fehler: {e}")
+            logger.error("❌ Telegram Bot Fehler: %s", e)
             raise
             
         # Initialisiere Trader mit Wallet aus Environment
@@ -85,7 +99,7 @@ class TradingBot:
             await trader.initialize()  # Loads keypair from PRIVATE_KEY env var
             logger.info("✅ Trader initialisiert")
         except Exception as e:
-            logger.error(f"❌ Trader Initialisierung fehlgeschlagen: {e}")
+            logger.error("❌ Trader Initialisierung fehlgeschlagen: %s", e)
             raise
 
         # Initialisiere Integration Layer (AI + Auto-Trading)
@@ -94,7 +108,7 @@ class TradingBot:
                 await initialize_integration()
                 logger.info("✅ AI & Auto-Trading initialisiert")
             except Exception as e:
-                logger.warning(f"⚠️ Integration initialization warning: {e}")
+                logger.warning("⚠️ Integration initialization warning: %s", e)
 
         # Sende Start-Nachricht
         ai_status = "✅ Active" if INTEGRATION_AVAILABLE else "⚠️ Disabled"
@@ -121,7 +135,7 @@ Verwende /start für das Hauptmenü.
         logger.info("🔄 Starte Scanner...")
         
         try:
-            self.scanner_task = asyncio.create_task(scanner.start())
+            self.scanner_task = asyncio.create_task(scanner.start(), name="scanner")
             logger.info("✅ Scanner gestartet")
             
             await telegram_bot.send_message(
@@ -130,12 +144,51 @@ Verwende /start für das Hauptmenü.
                 important=True
             )
         except Exception as e:
-            logger.error(f"❌ Scanner Start Fehler: {e}")
+            logger.error("❌ Scanner Start Fehler: %s", e)
             await telegram_bot.send_message(
                 f"❌ Scanner Fehler: {str(e)[:100]}",
                 important=True
             )
             
+    async def start_telegram(self):
+        """Startet die Telegram Application (Webhook wenn konfiguriert, sonst Polling).
+        run_webhook/run_polling blockieren und übernehmen den Event Loop - daher
+        initialize/start/updater einzeln auf dem bereits laufenden Loop"""
+        app = self.telegram_app
+        await app.initialize()
+        await app.start()
+        
+        webhook_url = os.environ.get('WEBHOOK_URL')
+        if webhook_url:
+            logger.info("🔄 Starte Telegram Bot Webhook...")
+            await app.updater.start_webhook(
+                listen=os.environ.get('WEBHOOK_LISTEN', '0.0.0.0'),
+                port=int(os.environ.get('WEBHOOK_PORT', '8443')),
+                webhook_url=webhook_url,
+                allowed_updates=_ALLOWED_UPDATES,
+                drop_pending_updates=True
+            )
+        else:
+            logger.info("🔄 Starte Telegram Bot Polling...")
+            await app.updater.start_polling(
+                allowed_updates=_ALLOWED_UPDATES,
+                drop_pending_updates=True
+            )
+            
+    async def stop_telegram(self):
+        """Stoppt Updater und Application in umgekehrter Start-Reihenfolge"""
+        app = self.telegram_app
+        if app is None:
+            return
+        try:
+            if app.updater and app.updater.running:
+                await app.updater.stop()
+            if app.running:
+                await app.stop()
+            await app.shutdown()
+        except Exception as e:
+            logger.error("Telegram Shutdown Fehler: %s", e)
+            
     async def run(self):
         """Haupt-Loop"""
         try:
@@ -145,23 +198,16 @@ Verwende /start für das Hauptmenü.
             # Starte Scanner automatisch
             await self.start_scanner()
             
-            # Starte Telegram Bot
-            logger.info("🔄 Starte Telegram Bot Polling...")
+            # Starte Telegram Bot auf dem laufenden Event Loop
+            await self.start_telegram()
             
-            # Run both Telegram polling and periodic tasks
-            await asyncio.gather(
-                self.telegram_app.run_polling(
-                    allowed_updates=Update.ALL_TYPES,
-                    drop_pending_updates=True
-                ),
-                self.periodic_tasks(),
-                return_exceptions=True
-            )
+            # Telegram Updates laufen im Hintergrund, hier die periodischen Tasks
+            await self.periodic_tasks()
             
-        except KeyboardInterrupt:
-            logger.info("⚠️ Keyboard Interrupt empfangen")
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            logger.info("⚠️ Shutdown Signal empfangen")
         except Exception as e:
-            logger.error(f"❌ Kritischer Fehler: {e}")
+            logger.error("❌ Kritischer Fehler: %s", e)
             await telegram_bot.send_message(
                 f"❌ *Bot Fehler:*\n`{str(e)[:200]}`",
                 important=True
@@ -176,21 +222,21 @@ Verwende /start für das Hauptmenü.
                 # Alle 5 Minuten: Status Update
                 await asyncio.sleep(300)
                 
-                uptime = (time.time() - self.start_time) / 60
-                status_msg = f"""
+                # Nur senden wenn Positionen vorhanden
+                positions = trader.positions
+                if positions:
+                    uptime = (time.time() - self.start_time) / 60
+                    status_msg = f"""
 *📊 Status Update*
 
 Uptime: {uptime:.0f} min
-Positions: {len(trader.positions)}
-Scanner Queue: {scanner.processing_queue.qsize()}
-                """
-                
-                # Nur senden wenn Positionen vorhanden
-                if trader.positions:
+Positions: {len(positions)}
+Scanner Queue: {scanner.qsize()}
+                    """
                     await telegram_bot.send_message(status_msg, important=True)
                     
             except Exception as e:
-                logger.error(f"Periodic Task Fehler: {e}")
+                logger.error("Periodic Task Fehler: %s", e)
                 await asyncio.sleep(60)
                 
     async def shutdown(self):
@@ -198,10 +244,9 @@ Scanner Queue: {scanner.processing_queue.qsize()}
         logger.info("🛑 Fahre Bot herunter...")
         self.running = False
         
-        # Stoppe Scanner
-        if self.scanner_task:
-            await scanner.stop()
-            
+        # Keine neuen Telegram Updates mehr annehmen
+        await self.stop_telegram()
+        
         # Schließe alle Positionen wenn gewünscht
         if trader.positions:
             await telegram_bot.send_message(
@@ -210,9 +255,21 @@ Scanner Queue: {scanner.processing_queue.qsize()}
                 important=True
             )
             
-        # Cleanup
-        await analyzer.cleanup()
-        await trader.cleanup()
+        # Stoppe Scanner zuerst - scanner.stop() räumt den Analyzer selbst auf,
+        # erst danach die übrigen Cleanups parallel
+        cleanup_steps = []
+        if self.scanner_task:
+            try:
+                await scanner.stop()
+            except Exception as e:
+                logger.error("Cleanup Fehler: %s", e)
+        else:
+            cleanup_steps.append(analyzer.cleanup())
+        cleanup_steps.append(trader.cleanup())
+        results = await asyncio.gather(*cleanup_steps, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error("Cleanup Fehler: %s", result)
         
         # Sende Shutdown Message
         await telegram_bot.send_message(
@@ -220,35 +277,52 @@ Scanner Queue: {scanner.processing_queue.qsize()}
             f"Laufzeit: {(time.time() - self.start_time) / 60:.0f} Minuten",
             important=True
         )
+        await telegram_bot.flush_messages()
         
         logger.info("✅ Bot sauber heruntergefahren")
 
 def handle_signal(signum, frame):
-    """Signal Handler für sauberes Shutdown"""
-    logger.info(f"Signal {signum} empfangen")
+    """Signal Handler für sauberes Shutdown (Windows Fallback)"""
+    logger.info("Signal %s empfangen", signum)
     raise KeyboardInterrupt
 
+def request_shutdown(signum: int, task: asyncio.Task):
+    """Signal Handler im Event Loop - bricht den Haupt-Task kooperativ ab"""
+    logger.info("Signal %s empfangen", signum)
+    task.cancel()
+
 async def main():
     """Main Entry Point"""
+    _configure_logging()
+
     # Setup Signal Handlers
-    signal.signal(signal.SIGINT, handle_signal)
-    signal.signal(signal.SIGTERM, handle_signal)
+    if sys.platform == 'win32':
+        # Proactor Event Loop unterstützt add_signal_handler nicht
+        signal.signal(signal.SIGINT, handle_signal)
+        signal.signal(signal.SIGTERM, handle_signal)
+    else:
+        loop = asyncio.get_running_loop()
+        main_task = asyncio.current_task()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, request_shutdown, sig, main_task)
     
     # Erstelle und starte Bot
     bot = TradingBot()
     await bot.run()
 
 if __name__ == '__main__':
-    # Python Version Check
-    if sys.version_info < (3, 10):
-        print("❌ Python 3.10+ erforderlich!")
-        sys.exit(1)
-        
-    # Platform-spezifische Event Loop Policy (Windows)
+    # Platform-spezifische Event Loop Policy
     if sys.platform == 'win32':
         asyncio.set_event_loop_policy(
             asyncio.WindowsProactorEventLoopPolicy()
         )
+    else:
+        # uvloop (libuv) für Scanner WebSockets und Telegram HTTP, falls installiert
+        try:
+            import uvloop
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        except ImportError:
+            pass
         
     # Starte Bot
     try:
@@ -256,5 +330,5 @@ if __name__ == '__main__':
     except KeyboardInterrupt:
         print("\n👋 Auf Wiedersehen!")
     except Exception as e:
-        logger.error(f"Fatal Error: {e}")
+        logger.error("Fatal Error: %s", e)
         sys.exit(1)
\ No newline at end of file
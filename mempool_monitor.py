@@ -4,18 +4,25 @@ Advanced Mempool Monitoring für Ultra-Early Token Detection
 Scannt pending Transactions für neue Opportunities
 """
 import asyncio
+import sys
 import websockets
-import json
+import orjson
 import time
-from typing import Dict, List, Set, Optional, Any
+from typing import Dict, List, Set, Optional, Any, Tuple
 from dataclasses import dataclass, field
-from collections import deque
-import base64
+from collections import deque, defaultdict
+from itertools import islice
+try:
+    # SIMD (AVX2/SSSE3/NEON) Base64 Decoder
+    from pybase64 import b64decode
+except ImportError:
+    from base64 import b64decode
+import numpy as np
 from solders.transaction import VersionedTransaction
 from solders.pubkey import Pubkey
 from solders.instruction import Instruction
 import aiohttp
-from enum import Enum
+from enum import IntEnum
 
 # Raydium & Orca Program IDs
 RAYDIUM_V4 = "675kPX9MHTjS2zt1qfr1NYHuzeLXfQM9H24wFSUt1Mp8"
@@ -27,16 +34,79 @@ JUPITER_V6 = "JUP6LkbZbjS1jKKwapdHNy74zcZ3tLUZoi5QNyVTaV4"
 # Token Program
 TOKEN_PROGRAM = "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA"
 
-class TransactionType(Enum):
-    """Transaction Kategorien"""
-    LP_CREATION = "LP_CREATION"
-    LARGE_BUY = "LARGE_BUY"
-    LARGE_SELL = "LARGE_SELL"
-    WHALE_MOVEMENT = "WHALE_MOVEMENT"
-    TOKEN_MINT = "TOKEN_MINT"
-    BURN_LIQUIDITY = "BURN_LIQUIDITY"
-    RUG_SIGNAL = "RUG_SIGNAL"
-    UNKNOWN = "UNKNOWN"
+# System Programs
+SYSTEM_PROGRAM = "11111111111111111111111111111111"
+COMPUTE_BUDGET_PROGRAM = "ComputeBudget111111111111111111111111111111"
+
+MONITORED_PROGRAMS = frozenset({
+    RAYDIUM_V4, RAYDIUM_CLMM, ORCA_WHIRLPOOL,
+    SERUM_DEX, JUPITER_V6, TOKEN_PROGRAM
+})
+
+# Program IDs als 32-Byte Raw Keys (Vergleich ohne Base58-Encoding)
+RAYDIUM_V4_BYTES = bytes(Pubkey.from_string(RAYDIUM_V4))
+RAYDIUM_CLMM_BYTES = bytes(Pubkey.from_string(RAYDIUM_CLMM))
+ORCA_WHIRLPOOL_BYTES = bytes(Pubkey.from_string(ORCA_WHIRLPOOL))
+JUPITER_V6_BYTES = bytes(Pubkey.from_string(JUPITER_V6))
+TOKEN_PROGRAM_BYTES = bytes(Pubkey.from_string(TOKEN_PROGRAM))
+SYSTEM_PROGRAM_BYTES = bytes(Pubkey.from_string(SYSTEM_PROGRAM))
+COMPUTE_BUDGET_BYTES = bytes(Pubkey.from_string(COMPUTE_BUDGET_PROGRAM))
+
+# Known Whirlpool init discriminator
+WHIRLPOOL_INIT_DISCRIMINATOR = b'\x95\xbb\x81\xfa\xaf\x23\xba\x59'
+
+# Raw-Message Marker für Pre-Filter vor dem JSON Parse
+_PARAMS_MARKER = '"params"'
+_SIGNATURE_MARKER = '"signature":"'
+
+# Bekannte Token (keine neuen Listings)
+KNOWN_TOKENS = frozenset({
+    "So11111111111111111111111111111111111111112",  # SOL
+    "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",  # USDC
+    # ... more known tokens
+})
+
+class TransactionType(IntEnum):
+    """Transaction Kategorien (Int-Werte = Codes im SoA Ring Buffer, 0 = leer)"""
+    LP_CREATION = 1
+    LARGE_BUY = 2
+    LARGE_SELL = 3
+    WHALE_MOVEMENT = 4
+    TOKEN_MINT = 5
+    BURN_LIQUIDITY = 6
+    RUG_SIGNAL = 7
+    UNKNOWN = 8
+
+# Anzahl Account Keys, die pro Transaction als String gespeichert werden
+MAX_STORED_ACCOUNTS = 8
+
+# Anzahl der letzten Transactions für die Pattern-Suche (max RING_SIZE)
+PATTERN_WINDOW = 100
+
+# Cache für _is_known_token RPC Ergebnisse
+KNOWN_TOKEN_CACHE_TTL = 300  # Sekunden
+KNOWN_TOKEN_CACHE_SIZE = 10000
+
+# getMultipleAccounts Batching
+LOOKUP_BATCH_INTERVAL = 0.02  # Sekunden
+LOOKUP_BATCH_SIZE = 100  # RPC Limit
+
+# Größe des Ring Buffers (entspricht pending_txs)
+RING_SIZE = 10000
+
+# Mint Index für get_pending_transactions: letzte N Transactions pro Token aus den
+# letzten MINT_INDEX_MAX_AGE Sekunden (inaktive Tokens räumt _purge_mint_index ab)
+MINT_INDEX_SIZE = 256
+MINT_INDEX_MAX_AGE = 60  # Sekunden
+
+# Eager Tasks (Python 3.12+) nur für kurze Hot-Path Tasks, nicht loop-weit
+_EAGER_TASK_FACTORY = getattr(asyncio, 'eager_task_factory', None)
+
+def _create_eager_task(coro) -> asyncio.Task:
+    """Task, der bis zum ersten await sofort läuft (ohne Scheduler-Runde), sonst normal"""
+    if _EAGER_TASK_FACTORY is not None:
+        return _EAGER_TASK_FACTORY(asyncio.get_running_loop(), coro)
+    return asyncio.create_task(coro)
 
 @dataclass
 class MempoolTransaction:
@@ -44,7 +114,7 @@ class MempoolTransaction:
     signature: str
     transaction_type: TransactionType
     program_id: str
-    accounts: List[str]
+    accounts: List[str]  # Nur die ersten MAX_STORED_ACCOUNTS Keys
     amount_sol: float = 0
     token_mint: Optional[str] = None
     priority_fee: int = 0
@@ -67,12 +137,29 @@ class MempoolMonitor:
         self.ws_url = rpc_url.replace("https", "wss").replace("http", "ws")
         
         # Tracking
-        self.monitored_programs = {
-            RAYDIUM_V4, RAYDIUM_CLMM, ORCA_WHIRLPOOL, 
-            SERUM_DEX, JUPITER_V6, TOKEN_PROGRAM
-        }
+        self.monitored_programs = MONITORED_PROGRAMS
         self.pending_txs: deque = deque(maxlen=10000)
+        # Bounded Dedup: Set für O(1) Lookup, Deque für FIFO-Eviction
         self.processed_signatures: Set[str] = set()
+        self._sig_order: deque = deque(maxlen=200_000)
+        # Index: token_mint -> letzte Transactions dieses Tokens
+        self._by_mint: Dict[str, deque] = defaultdict(lambda: deque(maxlen=MINT_INDEX_SIZE))
+        
+        # SoA Ring Buffer der letzten Transactions für vektorisierte Pattern-Suche
+        self._ring_amount = np.zeros(RING_SIZE, np.float32)
+        self._ring_type = np.zeros(RING_SIZE, np.int8)
+        self._ring_mint = np.zeros(RING_SIZE, np.int32)
+        self._ring_head = 0
+        self._ring_count = 0
+        # Mint Interner: id 0 = kein Mint
+        self._mint_ids: Dict[str, int] = {}
+        self._mint_names: List[Optional[str]] = [None]
+        
+        # Known-Token Cache: mint -> (known, timestamp)
+        self._known_cache: Dict[str, Tuple[bool, float]] = {}
+        self._known_order: deque = deque(maxlen=KNOWN_TOKEN_CACHE_SIZE)
+        self._known_inflight: Dict[str, asyncio.Future] = {}
+        self._pending_lookup: Dict[str, asyncio.Future] = {}
         
         # Pattern Detection
         self.lp_creation_patterns = {}
@@ -84,7 +171,8 @@ class MempoolMonitor:
             'total_monitored': 0,
             'lp_creations': 0,
             'large_trades': 0,
-            'signals_sent': 0
+            'signals_sent': 0,
+            'dropped': 0
         }
         
         # Websocket connection
@@ -97,6 +185,24 @@ class MempoolMonitor:
         # Signal Callbacks
         self.signal_callbacks = []
         
+        # Message Queue: WebSocket Reader -> Notification Worker
+        self._msg_queue: asyncio.Queue = asyncio.Queue(maxsize=50000)
+        self.num_workers = 4
+        self._workers: List[asyncio.Task] = []
+        
+        # Dispatch Table: Program ID (raw bytes) -> (Classifier, Mint Account Slot, Min Accounts)
+        # Raydium: Token mint at index 8 and 9, Orca: index 2
+        self._decoders = {
+            RAYDIUM_V4_BYTES: (self._classify_raydium, 8, 9),
+            RAYDIUM_CLMM_BYTES: (self._classify_raydium, 8, 9),
+            ORCA_WHIRLPOOL_BYTES: (self._classify_orca, 2, 2),
+            JUPITER_V6_BYTES: (self._analyze_jupiter_swap, None, 0),
+            TOKEN_PROGRAM_BYTES: (self._classify_token, None, 0),
+        }
+        
+        # Log Queue - Ausgabe erfolgt im Writer Task, nicht im Hot Path
+        self._log_q: asyncio.Queue = asyncio.Queue()
+        
     async def start(self):
         """Startet Mempool Monitoring"""
         print("🔍 Starting Mempool Monitor...")
@@ -110,8 +216,15 @@ class MempoolMonitor:
             asyncio.create_task(self._monitor_program_transactions()),
             asyncio.create_task(self._monitor_slot_updates()),
             asyncio.create_task(self._analyze_patterns()),
-            asyncio.create_task(self._stats_reporter())
+            asyncio.create_task(self._stats_reporter()),
+            asyncio.create_task(self._log_writer()),
+            asyncio.create_task(self._lookup_batcher())
         ]
+        self._workers = [
+            asyncio.create_task(self._notification_worker())
+            for _ in range(self.num_workers)
+        ]
+        tasks.extend(self._workers)
         
         await asyncio.gather(*tasks)
         
@@ -130,9 +243,13 @@ class MempoolMonitor:
                         
                     print(f"✅ Subscribed to {len(self.monitored_programs)} programs")
                     
-                    # Process incoming messages
+                    # Queue incoming messages for the workers
+                    msg_queue = self._msg_queue
                     async for message in websocket:
-                        asyncio.create_task(self._process_notification(message))
+                        try:
+                            msg_queue.put_nowait(message)
+                        except asyncio.QueueFull:
+                            self.stats['dropped'] += 1
                         
             except websockets.exceptions.ConnectionClosed:
                 print("⚠️ Mempool WebSocket disconnected, reconnecting...")
@@ -160,7 +277,7 @@ class MempoolMonitor:
         }
         
         if self.websocket:
-            await self.websocket.send(json.dumps(subscription))
+            await self.websocket.send(orjson.dumps(subscription).decode())
             
     async def _monitor_slot_updates(self):
         """
@@ -170,15 +287,15 @@ class MempoolMonitor:
             try:
                 async with websockets.connect(self.ws_url) as ws:
                     # Subscribe to slot updates
-                    await ws.send(json.dumps({
+                    await ws.send(orjson.dumps({
                         "jsonrpc": "2.0",
                         "id": 2,
                         "method": "slotSubscribe",
                         "params": []
-                    }))
+                    }).decode())
                     
                     async for message in ws:
-                        data = json.loads(message)
+                        data = orjson.loads(message)
                         if 'params' in data:
                             slot = data['params']['result']['slot']
                             # Use slot info for timing predictions
@@ -188,14 +305,40 @@ class MempoolMonitor:
                 print(f"Slot Monitor Error: {e}")
                 await asyncio.sleep(5)
                 
+    async def _notification_worker(self):
+        """
+        Verarbeitet Notifications aus der Queue sequentiell
+        """
+        msg_queue = self._msg_queue
+        try:
+            while self.running:
+                message = await msg_queue.get()
+                await self._process_notification(message)
+        except asyncio.CancelledError:
+            # stop() bricht das Warten auf die Queue ab
+            pass
+            
     async def _process_notification(self, message: str):
         """
         Verarbeitet eingehende Transaction Notifications
         """
         try:
-            data = json.loads(message)
             self.stats['total_monitored'] += 1
             
+            # Subscription-Acks etc. ohne Parse verwerfen
+            if _PARAMS_MARKER not in message:
+                return
+                
+            # Bereits gesehene Signature vor dem vollen Parse verwerfen
+            sig_pos = message.find(_SIGNATURE_MARKER)
+            if sig_pos != -1:
+                sig_start = sig_pos + len(_SIGNATURE_MARKER)
+                sig_end = message.find('"', sig_start)
+                if message[sig_start:sig_end] in self.processed_signatures:
+                    return
+                    
+            data = orjson.loads(message)
+            
             if 'params' not in data:
                 return
                 
@@ -208,6 +351,10 @@ class MempoolMonitor:
             if signature in self.processed_signatures:
                 return
                 
+            sig_order = self._sig_order
+            if len(sig_order) == sig_order.maxlen:
+                self.processed_signatures.discard(sig_order[0])
+            sig_order.append(signature)
             self.processed_signatures.add(signature)
             
             # Decode transaction
@@ -216,6 +363,9 @@ class MempoolMonitor:
             if tx_info:
                 # Store in pending queue
                 self.pending_txs.append(tx_info)
+                if tx_info.token_mint:
+                    self._by_mint[tx_info.token_mint].append(tx_info)
+                self._record_in_ring(tx_info)
                 
                 # Check for important patterns
                 signal = await self._check_for_signals(tx_info)
@@ -223,7 +373,7 @@ class MempoolMonitor:
                     await self._emit_signal(signal)
                     
         except Exception as e:
-            print(f"Process Notification Error: {e}")
+            self._log(f"Process Notification Error: {e}\n")
             
     async def _decode_transaction(self, tx_data: Dict, signature: str) -> Optional[MempoolTransaction]:
         """
@@ -232,10 +382,10 @@ class MempoolMonitor:
         try:
             # Decode base64 transaction
             if isinstance(tx_data, str):
-                tx_bytes = base64.b64decode(tx_data)
+                tx_bytes = b64decode(tx_data)
                 tx = VersionedTransaction.from_bytes(tx_bytes)
             else:
-                tx_bytes = base64.b64decode(tx_data.get('data', [''])[0])
+                tx_bytes = b64decode(tx_data.get('data', [''])[0])
                 tx = VersionedTransaction.from_bytes(tx_bytes)
                 
             # Extract instructions
@@ -244,34 +394,30 @@ class MempoolMonitor:
             if not instructions:
                 return None
                 
+            # Raw Keys für Program-Vergleiche, Base58 nur für benötigte Keys
+            account_keys = tx.message.account_keys
+            key_bytes = [bytes(key) for key in account_keys]
+            
             # Analyze first instruction (usually the main one)
             main_instruction = instructions[0]
-            program_id = str(tx.message.account_keys[main_instruction.program_id_index])
+            program_bytes = key_bytes[main_instruction.program_id_index]
             
-            # Determine transaction type
-            tx_type = await self._determine_transaction_type(
-                program_id, main_instruction, tx.message.account_keys
+            # Determine transaction type + token mint
+            tx_type, token_mint = self._classify(
+                program_bytes, main_instruction, account_keys
             )
             
             if tx_type == TransactionType.UNKNOWN:
                 return None
-                
-            # Extract token mint if applicable
-            token_mint = await self._extract_token_mint(
-                program_id, main_instruction, tx.message.account_keys
-            )
             
-            # Calculate SOL amount
-            amount_sol = await self._calculate_sol_amount(tx)
-            
-            # Check priority fee
-            priority_fee = self._extract_priority_fee(tx)
+            # Calculate SOL amount + priority fee
+            amount_sol, priority_fee = self._scan_sol_and_fee(instructions, key_bytes)
             
             return MempoolTransaction(
                 signature=signature,
                 transaction_type=tx_type,
-                program_id=program_id,
-                accounts=[str(key) for key in tx.message.account_keys],
+                program_id=str(account_keys[main_instruction.program_id_index]),
+                accounts=[str(key) for key in account_keys[:MAX_STORED_ACCOUNTS]],
                 amount_sol=amount_sol,
                 token_mint=token_mint,
                 priority_fee=priority_fee,
@@ -285,33 +431,52 @@ class MempoolMonitor:
             # Silently skip decode errors (many irrelevant txs)
             return None
             
-    async def _determine_transaction_type(self, program_id: str, 
-                                         instruction: Any, 
-                                         account_keys: List) -> TransactionType:
+    def _classify(self, program_id: bytes, 
+                  instruction: Any, 
+                  account_keys: List[Pubkey]) -> Tuple[TransactionType, Optional[str]]:
         """
-        Bestimmt den Transaction Type basierend auf Pattern
+        Bestimmt Transaction Type und Token Mint mit einem Lookup pro Program
         """
-        # Check for LP Creation
-        if program_id in [RAYDIUM_V4, RAYDIUM_CLMM]:
-            # Raydium LP Creation Pattern
-            if len(instruction.accounts) > 15:  # LP creation has many accounts
-                return TransactionType.LP_CREATION
-                
-        elif program_id == ORCA_WHIRLPOOL:
-            # Orca Whirlpool Creation
-            if self._is_whirlpool_creation(instruction):
-                return TransactionType.LP_CREATION
-                
-        # Check for large trades
-        elif program_id == JUPITER_V6:
-            # Could be large buy/sell
-            return await self._analyze_jupiter_swap(instruction, account_keys)
-            
-        # Check for token minting
-        elif program_id == TOKEN_PROGRAM:
-            if self._is_token_mint(instruction):
-                return TransactionType.TOKEN_MINT
-                
+        decoder = self._decoders.get(program_id)
+        if decoder is None:
+            return TransactionType.UNKNOWN, None
+            
+        classifier, mint_slot, min_accounts = decoder
+        tx_type = classifier(instruction, account_keys)
+        if tx_type == TransactionType.UNKNOWN or mint_slot is None:
+            return tx_type, None
+            
+        # For LP creations, mint is usually in specific position
+        # (bei Address Lookup Tables kann der Index hinter den statischen Keys liegen)
+        accounts = instruction.accounts
+        if len(accounts) > min_accounts:
+            key_index = accounts[mint_slot]
+            if key_index < len(account_keys):
+                return tx_type, str(account_keys[key_index])
+        return tx_type, None
+        
+    def _classify_raydium(self, instruction: Any, account_keys: List[Pubkey]) -> TransactionType:
+        """
+        Raydium LP Creation Pattern
+        """
+        if len(instruction.accounts) > 15:  # LP creation has many accounts
+            return TransactionType.LP_CREATION
+        return TransactionType.UNKNOWN
+        
+    def _classify_orca(self, instruction: Any, account_keys: List[Pubkey]) -> TransactionType:
+        """
+        Orca Whirlpool Creation
+        """
+        if self._is_whirlpool_creation(instruction):
+            return TransactionType.LP_CREATION
+        return TransactionType.UNKNOWN
+        
+    def _classify_token(self, instruction: Any, account_keys: List[Pubkey]) -> TransactionType:
+        """
+        Token Minting
+        """
+        if self._is_token_mint(instruction):
+            return TransactionType.TOKEN_MINT
         return TransactionType.UNKNOWN
         
     def _is_whirlpool_creation(self, instruction: Any) -> bool:
@@ -321,14 +486,9 @@ class MempoolMonitor:
         # Whirlpool creation has specific instruction discriminator
         try:
             data = instruction.data
-            if len(data) > 8:
-                discriminator = data[:8]
-                # Known Whirlpool init discriminator
-                if discriminator == bytes([0x95, 0xbb, 0x81, 0xfa, 0xaf, 0x23, 0xba, 0x59]):
-                    return True
+            return len(data) > 8 and data[:8] == WHIRLPOOL_INIT_DISCRIMINATOR
         except:
-            pass
-        return False
+            return False
         
     def _is_token_mint(self, instruction: Any) -> bool:
         """
@@ -340,8 +500,8 @@ class MempoolMonitor:
         except:
             return False
             
-    async def _analyze_jupiter_swap(self, instruction: Any, 
-                                   account_keys: List) -> TransactionType:
+    def _analyze_jupiter_swap(self, instruction: Any, 
+                                   account_keys: List[Pubkey]) -> TransactionType:
         """
         Analysiert Jupiter Swap für Buy/Sell Detection
         """
@@ -363,74 +523,43 @@ class MempoolMonitor:
             
         return TransactionType.UNKNOWN
         
-    async def _extract_token_mint(self, program_id: str, 
-                                 instruction: Any, 
-                                 account_keys: List) -> Optional[str]:
+    def _scan_sol_and_fee(self, instructions: List, 
+                          key_bytes: List[bytes]) -> Tuple[float, int]:
         """
-        Extrahiert Token Mint Address
+        Berechnet SOL Amount und Priority Fee in einem Durchlauf über die Instructions
         """
-        try:
-            # For LP creations, mint is usually in specific position
-            if program_id in [RAYDIUM_V4, RAYDIUM_CLMM]:
-                # Raydium: Token mint at index 8 and 9
-                if len(instruction.accounts) > 9:
-                    return str(account_keys[instruction.accounts[8]])
-                    
-            elif program_id == ORCA_WHIRLPOOL:
-                # Orca: Different position
-                if len(instruction.accounts) > 2:
-                    return str(account_keys[instruction.accounts[2]])
-                    
-        except:
-            pass
-            
-        return None
+        amount_sol = 0
+        priority_fee = 0
+        found_transfer = False
+        found_fee = False
         
-    async def _calculate_sol_amount(self, tx: VersionedTransaction) -> float:
-        """
-        Berechnet SOL Amount in Transaction
-        """
         try:
-            # Look for SOL transfer instructions
-            for instruction in tx.message.instructions:
-                program_id = str(tx.message.account_keys[instruction.program_id_index])
+            for instruction in instructions:
+                program_id = key_bytes[instruction.program_id_index]
+                data = instruction.data
                 
                 # System program transfer
-                if program_id == "11111111111111111111111111111111":
+                if not found_transfer and program_id == SYSTEM_PROGRAM_BYTES:
                     # Decode transfer amount
-                    if len(instruction.data) >= 12:
+                    if len(data) >= 12:
                         # First 4 bytes = instruction type
                         # Next 8 bytes = lamports
-                        lamports = int.from_bytes(instruction.data[4:12], 'little')
-                        return lamports / 1e9
+                        amount_sol = int.from_bytes(data[4:12], 'little') / 1e9
+                        found_transfer = True
                         
+                # ComputeBudget: SetComputeUnitPrice (Instruction type 3)
+                elif not found_fee and program_id == COMPUTE_BUDGET_BYTES:
+                    if len(data) >= 9 and data[0] == 3:
+                        priority_fee = int.from_bytes(data[1:9], 'little')
+                        found_fee = True
+                        
+                if found_transfer and found_fee:
+                    break
+                    
         except:
             pass
             
-        return 0
-        
-    def _extract_priority_fee(self, tx: VersionedTransaction) -> int:
-        """
-        Extrahiert Priority Fee aus Transaction
-        """
-        try:
-            # Look for ComputeBudget program
-            compute_budget_program = "ComputeBudget111111111111111111111111111111"
-            
-            for instruction in tx.message.instructions:
-                program_id = str(tx.message.account_keys[instruction.program_id_index])
-                
-                if program_id == compute_budget_program:
-                    # Parse compute unit price
-                    if len(instruction.data) >= 9:
-                        # Instruction type 3 = SetComputeUnitPrice
-                        if instruction.data[0] == 3:
-                            return int.from_bytes(instruction.data[1:9], 'little')
-                            
-        except:
-            pass
-            
-        return 0
+        return amount_sol, priority_fee
         
     async def _check_for_signals(self, tx: MempoolTransaction) -> Optional[EarlySignal]:
         """
@@ -486,37 +615,102 @@ class MempoolMonitor:
         Prüft ob Token bereits bekannt ist
         """
         # Check gegen bekannte Token Liste
-        known_tokens = {
-            "So11111111111111111111111111111111111111112",  # SOL
-            "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",  # USDC
-            # ... more known tokens
-        }
-        
-        if token_mint in known_tokens:
+        if token_mint in KNOWN_TOKENS:
             return True
             
-        # Check age via RPC
+        # Gecachtes RPC Ergebnis
+        cached = self._known_cache.get(token_mint)
+        if cached and time.time() - cached[1] < KNOWN_TOKEN_CACHE_TTL:
+            return cached[0]
+            
+        # Laufende Abfrage für denselben Mint teilen
+        inflight = self._known_inflight.get(token_mint)
+        if inflight:
+            return await inflight
+            
+        future = asyncio.get_running_loop().create_future()
+        self._known_inflight[token_mint] = future
+        known = None
         try:
-            if self.session:
-                # Get token info
-                payload = {
-                    "jsonrpc": "2.0",
-                    "id": 1,
-                    "method": "getAccountInfo",
-                    "params": [token_mint, {"encoding": "jsonParsed"}]
-                }
+            known = await self._fetch_token_known(token_mint)
+        finally:
+            del self._known_inflight[token_mint]
+            future.set_result(bool(known))
+            
+        if known is not None:
+            self._cache_known_token(token_mint, known)
+            
+        return bool(known)
+        
+    def _cache_known_token(self, token_mint: str, known: bool):
+        """
+        Speichert RPC Ergebnis im bounded Cache (FIFO-Eviction)
+        """
+        if token_mint not in self._known_cache:
+            order = self._known_order
+            if len(order) == order.maxlen:
+                self._known_cache.pop(order[0], None)
+            order.append(token_mint)
+        self._known_cache[token_mint] = (known, time.time())
+        
+    async def _fetch_token_known(self, token_mint: str) -> Optional[bool]:
+        """
+        Reiht Mint für den nächsten getMultipleAccounts Batch ein - None wenn die Abfrage fehlschlägt
+        """
+        if not self.session or not self.running:
+            return None
+            
+        future = self._pending_lookup.get(token_mint)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._pending_lookup[token_mint] = future
+        return await future
+        
+    async def _lookup_batcher(self):
+        """
+        Sammelt Known-Token Abfragen und sendet sie gebündelt (max 100 pro Request)
+        """
+        while self.running:
+            await asyncio.sleep(LOOKUP_BATCH_INTERVAL)
+            
+            while self._pending_lookup:
+                mints = list(islice(self._pending_lookup, LOOKUP_BATCH_SIZE))
+                futures = [self._pending_lookup.pop(mint) for mint in mints]
+                
+                results = await self._fetch_accounts_batch(mints)
                 
-                async with self.session.post(self.rpc_url, json=payload) as response:
-                    if response.status == 200:
-                        data = await response.json()
+                for i, future in enumerate(futures):
+                    if not future.done():
+                        future.set_result(results[i] if results else None)
+                        
+    async def _fetch_accounts_batch(self, mints: List[str]) -> Optional[List[bool]]:
+        """
+        Check age via RPC (getMultipleAccounts) - ein Eintrag pro Mint
+        """
+        try:
+            payload = {
+                "jsonrpc": "2.0",
+                "id": 1,
+                "method": "getMultipleAccounts",
+                "params": [
+                    mints,
+                    # Nur Existenz relevant - keine Account Daten übertragen
+                    {"encoding": "base64", "dataSlice": {"offset": 0, "length": 0}}
+                ]
+            }
+            
+            async with self.session.post(self.rpc_url, json=payload) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    values = data.get('result', {}).get('value')
+                    if values is not None and len(values) == len(mints):
                         # If account exists and is old, it's known
-                        if data.get('result', {}).get('value'):
-                            return True
-                            
+                        return [bool(value) for value in values]
+                        
         except:
             pass
             
-        return False
+        return None
         
     async def _is_suspicious_pattern(self, tx: MempoolTransaction) -> bool:
         """
@@ -528,14 +722,12 @@ class MempoolMonitor:
                 return True
                 
         # Multiple similar transactions in short time
-        recent_similar = [
-            t for t in self.pending_txs
-            if t.token_mint == tx.token_mint 
-            and abs(t.timestamp - tx.timestamp) < 1
-        ]
-        
-        if len(recent_similar) > 5:
-            return True
+        mint_txs = self._by_mint.get(tx.token_mint) if tx.token_mint else None
+        if mint_txs:
+            now = tx.timestamp
+            recent_similar = sum(1 for t in mint_txs if now - t.timestamp < 1)
+            if recent_similar > 5:
+                return True
             
         return False
         
@@ -545,19 +737,36 @@ class MempoolMonitor:
         """
         self.stats['signals_sent'] += 1
         
+        # Call all registered callbacks (eager: Signal-Verarbeitung startet sofort)
+        for callback in self.signal_callbacks:
+            _create_eager_task(callback(signal))
+            
         # Log signal
-        print(f"""
+        self._log(f"""
         🚨 EARLY SIGNAL DETECTED!
         Type: {signal.signal_type}
         Token: {signal.token_address[:8]}...
         Confidence: {signal.confidence:.1%}
         Action Required: {signal.action_required}
         Data: {signal.data}
-        """)
+        \n""")
+            
+    def _log(self, message: str):
+        """
+        Reiht Log-Ausgabe ein, ohne den Event Loop mit write() zu blockieren
+        """
+        self._log_q.put_nowait(message)
         
-        # Call all registered callbacks
-        for callback in self.signal_callbacks:
-            asyncio.create_task(callback(signal))
+    async def _log_writer(self):
+        """
+        Schreibt eingereihte Log-Ausgaben nach stdout, bis stop() den Sentinel einreiht
+        """
+        while True:
+            message = await self._log_q.get()
+            if message is None:
+                break
+            sys.stdout.write(message)
+        sys.stdout.flush()
             
     def register_signal_callback(self, callback):
         """
@@ -572,59 +781,102 @@ class MempoolMonitor:
         while self.running:
             await asyncio.sleep(5)  # Every 5 seconds
             
-            if len(self.pending_txs) < 10:
+            self._purge_mint_index()
+            self._compact_mint_ids()
+            
+            if self._ring_count < 10:
                 continue
                 
-            # Analyze recent transactions
-            recent_txs = list(self.pending_txs)[-100:]  # Last 100
-            
-            # Find patterns
-            patterns = await self._find_patterns(recent_txs)
+            # Find patterns in recent transactions
+            patterns = await self._find_patterns(PATTERN_WINDOW)
             
             if patterns:
                 for pattern in patterns:
-                    print(f"📊 Pattern gefunden: {pattern}")
+                    self._log(f"📊 Pattern gefunden: {pattern}\n")
                     
-    async def _find_patterns(self, transactions: List[MempoolTransaction]) -> List[Dict]:
+    def _purge_mint_index(self, max_age: float = MINT_INDEX_MAX_AGE):
+        """
+        Entfernt Mints ohne aktuelle Transactions aus dem Index
+        """
+        cutoff = time.time() - max_age
+        stale = [mint for mint, entries in self._by_mint.items() if entries[-1].timestamp < cutoff]
+        for mint in stale:
+            del self._by_mint[mint]
+            
+    def _record_in_ring(self, tx: MempoolTransaction):
+        """
+        Schreibt Transaction-Spalten in den SoA Ring Buffer
+        """
+        head = self._ring_head
+        self._ring_amount[head] = tx.amount_sol
+        self._ring_type[head] = tx.transaction_type
+        
+        mint_id = 0
+        mint = tx.token_mint
+        if mint:
+            mint_id = self._mint_ids.get(mint)
+            if mint_id is None:
+                mint_id = len(self._mint_names)
+                self._mint_ids[mint] = mint_id
+                self._mint_names.append(mint)
+        self._ring_mint[head] = mint_id
+        
+        self._ring_head = (head + 1) % RING_SIZE
+        if self._ring_count < RING_SIZE:
+            self._ring_count += 1
+            
+    def _compact_mint_ids(self):
         """
-        Findet Pattern in Transactions
+        Vergibt Mint IDs neu, sobald der Interner deutlich größer als der Ring ist
+        """
+        if len(self._mint_names) <= 4 * RING_SIZE:
+            return
+            
+        live = np.union1d(self._ring_mint, [0])
+        remap = np.zeros(len(self._mint_names), np.int32)
+        remap[live] = np.arange(len(live), dtype=np.int32)
+        
+        self._ring_mint = remap[self._ring_mint]
+        self._mint_names = [self._mint_names[i] for i in live]
+        self._mint_ids = {mint: i for i, mint in enumerate(self._mint_names) if mint}
+        
+    async def _find_patterns(self, window: int) -> List[Dict]:
+        """
+        Findet Pattern in den letzten `window` Transactions
         """
         patterns = []
         
+        count = min(window, self._ring_count)
+        idx = (self._ring_head - count + np.arange(count)) % RING_SIZE
+        tx_types = self._ring_type[idx]
+        amounts = self._ring_amount[idx]
+        mints = self._ring_mint[idx]
+        
         # Pattern 1: Rapid LP Creations
-        lp_creations = [
-            tx for tx in transactions 
-            if tx.transaction_type == TransactionType.LP_CREATION
-        ]
+        lp_mask = tx_types == TransactionType.LP_CREATION
+        lp_count = int(np.count_nonzero(lp_mask))
         
-        if len(lp_creations) > 3:
+        if lp_count > 3:
             # Multiple LPs in short time = potential pump wave
             patterns.append({
                 'type': 'LP_CREATION_WAVE',
-                'count': len(lp_creations),
-                'tokens': [tx.token_mint for tx in lp_creations if tx.token_mint]
+                'count': lp_count,
+                'tokens': [self._mint_names[i] for i in mints[lp_mask] if i]
             })
             
         # Pattern 2: Whale Accumulation
-        large_buys = [
-            tx for tx in transactions
-            if tx.transaction_type == TransactionType.LARGE_BUY
-            and tx.amount_sol > 1
-        ]
+        buy_mask = (tx_types == TransactionType.LARGE_BUY) & (amounts > 1) & (mints != 0)
         
-        # Group by token
-        token_buys = {}
-        for buy in large_buys:
-            if buy.token_mint:
-                token_buys[buy.token_mint] = token_buys.get(buy.token_mint, 0) + buy.amount_sol
-                
-        # Check for accumulation
-        for token, total_sol in token_buys.items():
-            if total_sol > 10:  # More than 10 SOL accumulated
+        if buy_mask.any():
+            # Group by token
+            token_buys = np.bincount(mints[buy_mask], weights=amounts[buy_mask])
+            
+            # Check for accumulation (More than 10 SOL accumulated)
+            for mint_id in np.nonzero(token_buys > 10)[0]:
                 patterns.append({
                     'type': 'WHALE_ACCUMULATION',
-                    'token': token,
-                    'total_sol': total_sol
+                    'token': self._mint_names[mint_id],
+                    'total_sol': float(token_buys[mint_id])
                 })
                 
         return patterns
@@ -654,12 +906,15 @@ class MempoolMonitor:
             
     async def get_pending_transactions(self, token_mint: str) -> List[MempoolTransaction]:
         """
-        Gibt pending Transactions für einen Token zurück
+        Gibt pending Transactions für einen Token zurück.
+        Liefert höchstens die letzten MINT_INDEX_SIZE Transactions, und nur solche
+        aus den letzten MINT_INDEX_MAX_AGE Sekunden (unabhängig vom Purge-Zyklus)
         """
-        return [
-            tx for tx in self.pending_txs
-            if tx.token_mint == token_mint
-        ]
+        entries = self._by_mint.get(token_mint)
+        if not entries:
+            return []
+        cutoff = time.time() - MINT_INDEX_MAX_AGE
+        return [tx for tx in entries if tx.timestamp >= cutoff]
         
     async def stop(self):
         """
@@ -668,6 +923,20 @@ class MempoolMonitor:
         print("🛑 Stopping Mempool Monitor...")
         self.running = False
         
+        # Worker hängen sonst in msg_queue.get() fest
+        for worker in self._workers:
+            worker.cancel()
+        self._workers = []
+        
+        # Log Writer schreibt noch alles Eingereihte und beendet sich dann
+        self._log_q.put_nowait(None)
+        
+        # Offene Known-Token Abfragen auflösen
+        for future in self._pending_lookup.values():
+            if not future.done():
+                future.set_result(None)
+        self._pending_lookup.clear()
+        
         if self.websocket:
             await self.websocket.close()
             
@@ -5,21 +5,37 @@ Verwendet Online Learning für kontinuierliche Verbesserung
 """
 import numpy as np
 import asyncio
-import pickle
 import os
+import copy
 from typing import Dict, List, Tuple, Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from collections import deque
+from itertools import islice, compress
+from operator import attrgetter
 import time
 import json
-from datetime import datetime, timedelta
-import aiofiles
+from datetime import datetime
 from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
 from sklearn.preprocessing import StandardScaler
-from sklearn.model_selection import train_test_split
-import joblib
-import pandas as pd
-from scipy import stats
+from sklearn.linear_model import SGDRegressor
+from sklearn.base import clone
+
+# Optional: Treelite kompiliert die Tree Ensembles zu nativem Code
+try:
+    import treelite
+    import tl2cgen
+    TREELITE_AVAILABLE = True
+except ImportError:
+    TREELITE_AVAILABLE = False
+
+# Optional: ONNX Export + ONNX Runtime Inferenz (Fallback wenn Treelite fehlt)
+try:
+    import onnxruntime
+    from skl2onnx import convert_sklearn
+    from skl2onnx.common.data_types import FloatTensorType
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
 
 @dataclass
 class TokenFeatures:
@@ -70,36 +86,59 @@ class TokenFeatures:
     
     def to_array(self) -> np.ndarray:
         """Konvertiert zu NumPy Array für Model"""
-        return np.array([
-            self.liquidity_usd,
-            self.liquidity_change_5m,
-            self.market_cap,
-            self.age_minutes,
-            self.holder_count,
-            self.holder_growth_rate,
-            self.top_10_percentage,
-            self.distribution_score,
-            self.volume_5m,
-            self.volume_1h,
-            self.volume_liquidity_ratio,
-            self.buy_sell_ratio,
-            self.price_change_5m,
-            self.price_change_1h,
-            self.volatility,
-            self.momentum_score,
-            self.tx_count_5m,
-            self.avg_tx_size,
-            self.large_tx_ratio,
-            self.unique_traders,
-            self.rsi,
-            self.volume_weighted_price,
-            self.price_acceleration,
-            self.hour_of_day,
-            self.day_of_week,
-            int(self.is_weekend),
-            self.network_congestion,
-            self.gas_price
-        ])
+        return np.array(_feature_values(self), dtype=np.float32)
+
+# Feature-Reihenfolge für alle Model-Inputs
+FEATURE_NAMES = (
+    'liquidity_usd', 'liquidity_change_5m', 'market_cap', 'age_minutes',
+    'holder_count', 'holder_growth_rate', 'top_10_percentage', 'distribution_score',
+    'volume_5m', 'volume_1h', 'volume_liquidity_ratio', 'buy_sell_ratio',
+    'price_change_5m', 'price_change_1h', 'volatility', 'momentum_score',
+    'tx_count_5m', 'avg_tx_size', 'large_tx_ratio', 'unique_traders',
+    'rsi', 'volume_weighted_price', 'price_acceleration',
+    'hour_of_day', 'day_of_week', 'is_weekend', 'network_congestion', 'gas_price'
+)
+NUM_FEATURES = len(FEATURE_NAMES)
+
+# Spalten-Index je Feature Name
+_COL = {name: i for i, name in enumerate(FEATURE_NAMES)}
+
+# Gewichte der Confidence-Indikatoren (siehe _calculate_confidence)
+_CONFIDENCE_WEIGHTS = (0.1, 0.1, 0.1, 0.1, 0.1, -0.2, -0.1)
+
+
+def _build_confidence_table() -> np.ndarray:
+    """
+    Confidence je Indikator-Kombination (Bit i = Indikator i), in float64 und
+    in derselben Additions-Reihenfolge wie die alte Einzel-Berechnung
+    """
+    table = np.empty(1 << len(_CONFIDENCE_WEIGHTS), dtype=np.float64)
+    for mask in range(len(table)):
+        confidence = 0.5  # Base confidence
+        for bit, weight in enumerate(_CONFIDENCE_WEIGHTS):
+            if mask >> bit & 1:
+                confidence += weight
+        table[mask] = np.clip(confidence, 0, 1)
+    return table
+
+
+_CONFIDENCE_TABLE = _build_confidence_table()
+_CONFIDENCE_BITS = 1 << np.arange(len(_CONFIDENCE_WEIGHTS), dtype=np.int64)
+
+# Max. Samples für die Treelite Branch-Annotation
+ANNOTATION_SAMPLES = 10000
+
+# Action Codes aus _determine_action
+_ACTIONS = ("SKIP", "BUY_STRONG", "BUY", "BUY_SMALL")
+
+# Exit Signale in Spalten-Reihenfolge von _identify_exit_indicators
+_EXIT_INDICATORS = ("LOW_VOLUME", "HOLDER_DECLINE", "MOMENTUM_LOSS", "OVERBOUGHT", "WHALE_ACTIVITY")
+
+# Ring-Buffer Größe der Prediction History
+PREDICTION_HISTORY_SIZE = 1000
+
+# Liest alle Features in einem C-Level Call als Tuple
+_feature_values = attrgetter(*FEATURE_NAMES)
 
 @dataclass
 class PredictionResult:
@@ -121,8 +160,21 @@ class MLPredictor:
             'timing': None    # Predicts optimal hold time
         }
         self.scaler = StandardScaler()
+        # Gecachte float32 Scaler-Parameter für den Inferenz-Pfad
+        self._mean: Optional[np.ndarray] = None
+        self._inv_scale: Optional[np.ndarray] = None
         self.feature_history = deque(maxlen=10000)
-        self.prediction_history = deque(maxlen=1000)
+        
+        # Prediction History als NumPy Ring-Buffer (eine Zeile pro Prediction)
+        self._hist_feat = np.zeros((PREDICTION_HISTORY_SIZE, NUM_FEATURES), dtype=np.float32)
+        # Spalten: predicted_return, confidence, risk_score, position_size
+        self._hist_pred = np.zeros((PREDICTION_HISTORY_SIZE, 4), dtype=np.float32)
+        self._hist_addr = np.empty(PREDICTION_HISTORY_SIZE, dtype=object)
+        # Spalten: actual_return, actual_hold_time (NaN = noch kein Outcome)
+        self._hist_actual = np.full((PREDICTION_HISTORY_SIZE, 2), np.nan, dtype=np.float32)
+        self._hist_idx = 0
+        self._hist_count = 0
+        
         self.model_performance = {
             'accuracy': 0.0,
             'precision': 0.0,
@@ -134,14 +186,52 @@ class MLPredictor:
         os.makedirs(self.model_dir, exist_ok=True)
         
         # Online Learning Parameters
-        self.retrain_threshold = 100  # Retrain after N new samples
+        self.retrain_threshold = 100  # Tree Re-Fit frühestens nach N neuen Samples
+        self.tree_refit_interval = 6 * 3600  # Tree Re-Fit höchstens alle 6h
         self.new_samples = []
+        self._last_tree_fit = time.time()
+        self._retraining = False  # Re-Fit läuft gerade im Executor
+        
+        # Inkrementelle Models (partial_fit) lernen den Residual-Fehler der Trees,
+        # mit eigenem Streaming-Scaler (Trees bleiben auf ihrem Scaler fixiert)
+        self.online_models = self._new_online_models()
+        self.online_scaler = StandardScaler()
+        self._online_ready = False
         
         # Feature Importance Tracking
         self.feature_importance = {}
         
-        # Initialize
-        asyncio.create_task(self._initialize())
+        # Micro-Batching: gleichzeitige predict() Calls teilen sich einen Model-Call
+        self.batch_window = 0.005  # Sekunden
+        self._pending: List[Tuple[TokenFeatures, asyncio.Future]] = []
+        self._feat_buf = np.empty((64, NUM_FEATURES), dtype=np.float32)
+        self._feat_buf64 = np.empty((64, NUM_FEATURES), dtype=np.float64)
+        self._batch_task: Optional[asyncio.Task] = None
+        
+        # Kompilierte Predictors (Treelite), dann ONNX Runtime, Fallback auf sklearn
+        self._compiled: Dict = {}
+        self._ort: Dict = {}
+        
+        # (Minuten-Bucket, (hour_of_day, day_of_week, is_weekend))
+        self._time_cache: Tuple[int, Optional[Tuple[int, int, bool]]] = (0, None)
+        
+        # Initialisierung läuft explizit über create()/initialize(), nicht im Konstruktor
+        self._ready = asyncio.Event()
+        self._init_task: Optional[asyncio.Task] = None
+        
+    @classmethod
+    async def create(cls) -> 'MLPredictor':
+        """Async Factory - liefert einen vollständig initialisierten Predictor"""
+        self = cls()
+        await self.initialize()
+        return self
+        
+    async def initialize(self):
+        """Startet die Initialisierung einmalig und wartet auf deren Abschluss"""
+        if self._init_task is None:
+            self._init_task = asyncio.create_task(self._initialize())
+        # Shield: ein abgebrochener Aufrufer bricht nicht die Initialisierung ab
+        await asyncio.shield(self._init_task)
         
     async def _initialize(self):
         """Lädt oder trainiert Models"""
@@ -150,40 +240,30 @@ class MLPredictor:
             await self.load_models()
             print("✅ ML Models geladen")
         except:
-            # Trainiere neue Models mit Beispieldaten
+            # Trainiere neue Models mit Beispieldaten (kompiliert inkl. Branch-Annotation)
             print("🔄 Trainiere neue ML Models...")
             await self.train_initial_models()
+        else:
+            await self._compile_models()
+            
+        self._ready.set()
             
     async def predict(self, token_metrics: Dict) -> PredictionResult:
         """
         Hauptvorhersage-Funktion
         """
         try:
+            # Warte auf geladene/trainierte Models statt still in den Fallback zu laufen
+            if not self._ready.is_set():
+                await self.initialize()
+                
             # Extract Features
             features = await self._extract_features(token_metrics)
-            feature_array = features.to_array().reshape(1, -1)
-            
-            # Scale Features
-            feature_scaled = self.scaler.transform(feature_array)
-            
-            # Predictions von allen Models
-            predicted_return = self.models['returns'].predict(feature_scaled)[0]
-            risk_score = self.models['risk'].predict(feature_scaled)[0]
-            optimal_hold_time = self.models['timing'].predict(feature_scaled)[0]
             
-            # Calculate Confidence
-            confidence = self._calculate_confidence(features, predicted_return)
-            
-            # Determine Action
-            action = self._determine_action(predicted_return, risk_score, confidence)
-            
-            # Calculate Position Size mit Kelly Criterion
-            position_size = self._calculate_position_size(
-                predicted_return, risk_score, confidence
-            )
-            
-            # Identify Exit Indicators
-            exit_indicators = self._identify_exit_indicators(features)
+            # Predictions von allen Models (gebündelt mit parallelen Calls) inkl.
+            # Confidence, Action, Position Size und Exit Indicators aus demselben Batch
+            (predicted_return, risk_score, optimal_hold_time, confidence,
+             action, position_size, exit_indicators) = await self._predict_batched(features)
             
             result = PredictionResult(
                 token_address=token_metrics.get('address', ''),
@@ -206,11 +286,187 @@ class MLPredictor:
             # Fallback auf regelbasierte Prediction
             return self._fallback_prediction(token_metrics)
             
+    async def _predict_batched(self, features: TokenFeatures) -> Tuple:
+        """
+        Reiht Features in den nächsten Batch ein
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((features, future))
+        
+        if self._batch_task is None or self._batch_task.done():
+            self._batch_task = asyncio.create_task(self._flush_batch())
+            
+        return await future
+        
+    async def _flush_batch(self):
+        """
+        Sammelt Predictions für batch_window und führt alle Models einmal pro Batch aus
+        """
+        await asyncio.sleep(self.batch_window)
+        
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+            
+        try:
+            # Features in vorallokierte Buffer schreiben: float64 für die Schwellen
+            # (wie die Python-Werte), float32 nur als Model Input
+            n = len(pending)
+            if n > len(self._feat_buf):
+                self._feat_buf = np.empty((n, NUM_FEATURES), dtype=np.float32)
+                self._feat_buf64 = np.empty((n, NUM_FEATURES), dtype=np.float64)
+            X64 = self._feat_buf64[:n]
+            for i, (features, _) in enumerate(pending):
+                X64[i] = _feature_values(features)
+            X = self._feat_buf[:n]
+            np.copyto(X, X64)
+                
+            X_scaled = self._scale(X)
+            X_online = self.online_scaler.transform(X) if self._online_ready else None
+            
+            returns = self._predict_model('returns', X_scaled, X_online)
+            risks = self._predict_model('risk', X_scaled, X_online)
+            timings = self._predict_model('timing', X_scaled, X_online)
+            
+            # Post-Processing einmal pro Batch als Vektor-Operationen
+            confidences = self._calculate_confidence(X64)
+            actions = self._determine_action(returns, risks, confidences)
+            positions = self._calculate_position_size(returns, risks, confidences)
+            exit_indicators = self._identify_exit_indicators(X64)
+        except Exception as e:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+            
+        rows = zip(
+            returns.tolist(), risks.tolist(), timings.tolist(), confidences.tolist(),
+            actions, positions.tolist(), exit_indicators
+        )
+        for row, (_, future) in zip(rows, pending):
+            if future.done():
+                continue
+            if row[0] == 0:
+                # Kelly teilt durch den Return: wie bisher regelbasierter Fallback in predict()
+                future.set_exception(ZeroDivisionError("predicted_return ist 0"))
+            else:
+                future.set_result(row)
+                
+    def _predict_model(self, name: str, X_scaled: np.ndarray,
+                       X_online: Optional[np.ndarray]) -> np.ndarray:
+        """
+        Tree Prediction plus Online-Korrektur aus dem inkrementellen Model
+        """
+        # float64 wie sklearn, auch wenn Treelite/ONNX float32 liefern
+        y = np.asarray(self._predict_tree(name, X_scaled), dtype=np.float64)
+        if X_online is not None:
+            y = y + self.online_models[name].predict(X_online)
+        return y
+        
+    def _predict_tree(self, name: str, X_scaled: np.ndarray) -> np.ndarray:
+        """
+        Prediction über kompilierten Predictor wenn vorhanden, sonst sklearn
+        """
+        compiled = self._compiled.get(name)
+        if compiled is not None:
+            return compiled.predict(tl2cgen.DMatrix(X_scaled)).reshape(-1)
+        session = self._ort.get(name)
+        if session is not None:
+            return session.run(None, {'X': X_scaled})[0].reshape(-1)
+        return self.models[name].predict(X_scaled)
+        
+    @staticmethod
+    def _new_online_models() -> Dict[str, SGDRegressor]:
+        """
+        Erstellt frische SGD Models für das inkrementelle Lernen
+        """
+        return {
+            name: SGDRegressor(loss='huber', learning_rate='adaptive', eta0=0.01)
+            for name in ('returns', 'risk', 'timing')
+        }
+        
+    def _set_scaler(self, scaler: StandardScaler):
+        """
+        Setzt den Tree-Scaler und cached Mean/Inverse-Scale als float32
+        """
+        self.scaler = scaler
+        self._mean = scaler.mean_.astype(np.float32)
+        self._inv_scale = (1.0 / scaler.scale_).astype(np.float32)
+        
+    def _scale(self, X: np.ndarray) -> np.ndarray:
+        """
+        Fused (X - mean) * inv_scale ohne sklearn Input-Validierung
+        """
+        X_scaled = np.subtract(X, self._mean, dtype=np.float32)
+        X_scaled *= self._inv_scale
+        return X_scaled
+        
+    def _reset_online(self):
+        """
+        Startet die Online Models frisch auf den aktuellen Trees
+        """
+        self.online_models = self._new_online_models()
+        # Streaming-Statistik übernimmt Mean/Varianz des Tree-Scalers als Startwert
+        self.online_scaler = copy.deepcopy(self.scaler)
+        self._online_ready = False
+        
+    async def _compile_models(self, X_scaled: Optional[np.ndarray] = None):
+        """
+        Kompiliert alle Models mit Treelite (im Executor, blockiert nicht den Event Loop)
+        """
+        if not TREELITE_AVAILABLE:
+            return
+        compiled = await asyncio.get_running_loop().run_in_executor(
+            None, self._build_compiled_predictors, X_scaled
+        )
+        # Atomarer Austausch - laufende Batches nutzen weiter die alten Predictors
+        self._compiled = compiled
+        
+    def _build_compiled_predictors(self, X_scaled: Optional[np.ndarray] = None) -> Dict:
+        """
+        Exportiert jedes sklearn Model als Shared Library und lädt es.
+        Mit Trainingsdaten werden die Branches annotiert, damit der generierte
+        C-Code die häufigen Pfade als likely markiert (v.a. die flachen Random Forests).
+        """
+        compiled = {}
+        if X_scaled is not None:
+            annotate_data = tl2cgen.DMatrix(X_scaled[:ANNOTATION_SAMPLES])
+            
+        for name, model in self.models.items():
+            try:
+                libpath = os.path.join(self.model_dir, f"{name}_model.so")
+                annotation = os.path.join(self.model_dir, f"{name}_branches.json")
+                tl_model = treelite.sklearn.import_model(model)
+                
+                params = {'parallel_comp': 8}
+                if X_scaled is not None:
+                    tl2cgen.annotate_branch(tl_model, annotate_data, path=annotation)
+                if os.path.exists(annotation):
+                    # Gespeicherte Annotation gehört zum gespeicherten Model
+                    params['annotate_in'] = annotation
+                    
+                tl2cgen.export_lib(
+                    tl_model,
+                    toolchain='gcc',
+                    libpath=libpath,
+                    params=params
+                )
+                compiled[name] = tl2cgen.Predictor(libpath, nthread=1)
+            except Exception as e:
+                print(f"Treelite Compile Error ({name}): {e}")
+        return compiled
+        
     async def _extract_features(self, metrics: Dict) -> TokenFeatures:
         """
         Extrahiert ML Features aus Token Metriken
         """
-        now = datetime.now()
+        # Zeit-Features ändern sich nur minütlich - datetime.now() einmal pro Minute
+        bucket = int(time.time()) // 60
+        if bucket != self._time_cache[0]:
+            now = datetime.now()
+            weekday = now.weekday()
+            self._time_cache = (bucket, (now.hour, weekday, weekday >= 5))
+        hour_of_day, day_of_week, is_weekend = self._time_cache[1]
         
         # Calculate derived features
         liquidity = metrics.get('liquidity_usd', 0)
@@ -258,145 +514,118 @@ class MLPredictor:
             rsi=rsi,
             volume_weighted_price=metrics.get('vwap', 0),
             price_acceleration=metrics.get('price_acceleration', 0),
-            hour_of_day=now.hour,
-            day_of_week=now.weekday(),
-            is_weekend=now.weekday() >= 5,
+            hour_of_day=hour_of_day,
+            day_of_week=day_of_week,
+            is_weekend=is_weekend,
             network_congestion=network_congestion,
             gas_price=metrics.get('gas_price', 5000)
         )
         
-    def _calculate_confidence(self, features: TokenFeatures, 
-                            predicted_return: float) -> float:
+    def _calculate_confidence(self, X: np.ndarray) -> np.ndarray:
         """
-        Berechnet Confidence Score basierend auf Feature Quality
+        Berechnet Confidence Scores basierend auf Feature Quality (ganzer Batch, ohne Branches)
         """
-        confidence = 0.5  # Base confidence
+        indicators = np.stack((
+            # Adjust based on data quality
+            X[:, _COL['holder_count']] > 100,
+            X[:, _COL['volume_5m']] > 10000,
+            X[:, _COL['liquidity_usd']] > 20000,
+            np.abs(X[:, _COL['buy_sell_ratio']] - 1) < 0.2,  # Balanced buying/selling
+            (X[:, _COL['age_minutes']] > 5) & (X[:, _COL['age_minutes']] < 60),
+            # Penalize for red flags
+            X[:, _COL['top_10_percentage']] > 50,
+            X[:, _COL['distribution_score']] > 0.8,  # High inequality
+        ), axis=1)
         
-        # Adjust based on data quality
-        if features.holder_count > 100:
-            confidence += 0.1
-        if features.volume_5m > 10000:
-            confidence += 0.1
-        if features.liquidity_usd > 20000:
-            confidence += 0.1
-        if abs(features.buy_sell_ratio - 1) < 0.2:  # Balanced buying/selling
-            confidence += 0.1
-        if features.age_minutes > 5 and features.age_minutes < 60:
-            confidence += 0.1
-            
-        # Penalize for red flags
-        if features.top_10_percentage > 50:
-            confidence -= 0.2
-        if features.distribution_score > 0.8:  # High inequality
-            confidence -= 0.1
-            
-        # Model-specific confidence
-        if hasattr(self.models['returns'], 'predict_proba'):
-            try:
-                proba = self.models['returns'].predict_proba([[predicted_return]])
-                model_confidence = np.max(proba)
-                confidence = (confidence + model_confidence) / 2
-            except:
-                pass
-                
-        return np.clip(confidence, 0, 1)
+        # Lookup statt Matrix-Produkt: bit-genau gleich zur sequentiellen Summe
+        return _CONFIDENCE_TABLE[indicators @ _CONFIDENCE_BITS]
         
-    def _determine_action(self, predicted_return: float, 
-                         risk_score: float, confidence: float) -> str:
+    def _determine_action(self, predicted_return: np.ndarray,
+                         risk_score: np.ndarray, confidence: np.ndarray) -> List[str]:
         """
-        Bestimmt empfohlene Aktion
+        Bestimmt empfohlene Aktionen für den ganzen Batch
         """
         # Risk-adjusted return
         risk_adjusted = predicted_return * (1 - risk_score)
         
-        if confidence < 0.3:
-            return "SKIP"
+        # Reihenfolge entspricht der Priorität, Default ist SKIP
+        codes = np.select(
+            [
+                confidence < 0.3,
+                (risk_adjusted > 50) & (confidence > 0.7),
+                (risk_adjusted > 20) & (confidence > 0.5),
+                (risk_adjusted > 10) & (risk_score < 0.3),
+            ],
+            [0, 1, 2, 3],
+            default=0
+        )
+        return [_ACTIONS[code] for code in codes.tolist()]
         
-        if risk_adjusted > 50 and confidence > 0.7:
-            return "BUY_STRONG"
-        elif risk_adjusted > 20 and confidence > 0.5:
-            return "BUY"
-        elif risk_adjusted > 10 and risk_score < 0.3:
-            return "BUY_SMALL"
-        else:
-            return "SKIP"
-            
-    def _calculate_position_size(self, predicted_return: float,
-                                risk_score: float, confidence: float) -> float:
+    def _calculate_position_size(self, predicted_return: np.ndarray,
+                                risk_score: np.ndarray, confidence: np.ndarray) -> np.ndarray:
         """
-        Berechnet optimale Position Size mit Kelly Criterion
+        Berechnet optimale Position Sizes mit Kelly Criterion (ganzer Batch)
         """
         # Kelly Formula angepasst für Crypto
         win_prob = confidence
         loss_prob = 1 - confidence
         win_amount = predicted_return / 100  # Convert to decimal
-        loss_amount = risk_score
-        
-        if loss_amount == 0:
-            loss_amount = 0.1  # Minimum loss assumption
-            
-        kelly_fraction = (win_prob * win_amount - loss_prob * loss_amount) / win_amount
+        loss_amount = np.where(risk_score == 0, 0.1, risk_score)  # Minimum loss assumption
         
-        # Conservative Kelly (25% of full Kelly)
-        conservative_kelly = kelly_fraction * 0.25
+        with np.errstate(divide='ignore', invalid='ignore'):
+            kelly_fraction = (win_prob * win_amount - loss_prob * loss_amount) / win_amount
         
-        # Apply bounds
-        position_size = np.clip(conservative_kelly, 0.01, 0.5)
+        # Conservative Kelly (25% of full Kelly), Apply bounds
+        position_size = np.clip(kelly_fraction * 0.25, 0.01, 0.5)
         
         # Further adjust based on confidence
-        if confidence < 0.5:
-            position_size *= 0.5
-        elif confidence > 0.8:
-            position_size *= 1.2
-            
-        return round(position_size, 3)
+        position_size *= np.where(confidence < 0.5, 0.5, np.where(confidence > 0.8, 1.2, 1.0))
+        
+        return np.round(position_size, 3)
         
-    def _identify_exit_indicators(self, features: TokenFeatures) -> List[str]:
+    def _identify_exit_indicators(self, X: np.ndarray) -> List[List[str]]:
         """
-        Identifiziert Signale für Exit
+        Identifiziert Signale für Exit (ganzer Batch)
         """
-        indicators = []
+        flags = np.stack((
+            X[:, _COL['volume_liquidity_ratio']] < 0.1,
+            X[:, _COL['holder_growth_rate']] < -10,
+            X[:, _COL['momentum_score']] < -20,
+            X[:, _COL['rsi']] > 80,
+            X[:, _COL['large_tx_ratio']] > 0.5,
+        ), axis=1)
         
-        if features.volume_liquidity_ratio < 0.1:
-            indicators.append("LOW_VOLUME")
-        if features.holder_growth_rate < -10:
-            indicators.append("HOLDER_DECLINE")
-        if features.momentum_score < -20:
-            indicators.append("MOMENTUM_LOSS")
-        if features.rsi > 80:
-            indicators.append("OVERBOUGHT")
-        if features.large_tx_ratio > 0.5:
-            indicators.append("WHALE_ACTIVITY")
-            
-        return indicators
+        return [list(compress(_EXIT_INDICATORS, row)) for row in flags.tolist()]
         
     def _calculate_gini_coefficient(self, distribution: List[float]) -> float:
         """
         Berechnet Gini Coefficient für Holder Distribution
         """
-        if not distribution:
+        values = np.asarray(distribution, dtype=np.float64)
+        if values.size == 0:
             return 1.0
             
-        sorted_dist = sorted(distribution)
-        n = len(sorted_dist)
-        cumsum = np.cumsum(sorted_dist)
+        values = np.sort(values)
+        n = values.size
+        ranks = np.arange(1, n + 1, dtype=np.float64)
         
-        return (2 * np.sum((np.arange(1, n+1) * sorted_dist))) / (n * cumsum[-1]) - (n + 1) / n
+        return (2.0 * np.dot(ranks, values)) / (n * values.sum()) - (n + 1) / n
         
     def _calculate_momentum(self, price_history: List[float]) -> float:
         """
         Berechnet Price Momentum
         """
-        if len(price_history) < 2:
+        n = len(price_history)
+        if n < 2:
             return 0
             
         # Rate of Change
         roc = ((price_history[-1] - price_history[0]) / price_history[0]) * 100
         
-        # Smooth momentum with moving average
-        if len(price_history) > 5:
-            ma5 = np.mean(price_history[-5:])
-            ma10 = np.mean(price_history[-10:]) if len(price_history) > 10 else ma5
+        # Smooth momentum with moving average (kurze Serien: Python-Summen statt NumPy Dispatch)
+        if n > 5:
+            ma5 = sum(price_history[-5:]) / 5
+            ma10 = sum(price_history[-10:]) / 10 if n > 10 else ma5
             momentum = ((ma5 - ma10) / ma10) * 100
             return (roc + momentum) / 2
             
@@ -409,12 +638,22 @@ class MLPredictor:
         if len(prices) < period:
             return 50  # Neutral RSI
             
-        deltas = np.diff(prices)
-        gains = deltas[deltas > 0]
-        losses = -deltas[deltas < 0]
-        
-        avg_gain = np.mean(gains) if len(gains) > 0 else 0
-        avg_loss = np.mean(losses) if len(losses) > 0 else 0.001
+        # Single Pass über die Deltas - keine Zwischen-Arrays
+        gain_sum = loss_sum = 0.0
+        gain_count = loss_count = 0
+        prev = prices[0]
+        for price in islice(prices, 1, None):
+            delta = price - prev
+            prev = price
+            if delta > 0:
+                gain_sum += delta
+                gain_count += 1
+            elif delta < 0:
+                loss_sum -= delta
+                loss_count += 1
+                
+        avg_gain = gain_sum / gain_count if gain_count else 0
+        avg_loss = loss_sum / loss_count if loss_count else 0.001
         
         rs = avg_gain / avg_loss
         rsi = 100 - (100 / (1 + rs))
@@ -433,39 +672,91 @@ class MLPredictor:
         """
         Speichert Prediction für Online Learning
         """
-        self.prediction_history.append({
-            'timestamp': time.time(),
-            'features': asdict(features),
-            'prediction': asdict(result)
-        })
+        i = self._hist_idx
+        self._hist_feat[i] = _feature_values(features)
+        self._hist_pred[i] = (
+            result.predicted_return, result.confidence,
+            result.risk_score, result.recommended_position_size
+        )
+        self._hist_addr[i] = result.token_address
+        self._hist_actual[i] = np.nan
+        
+        self._hist_idx = (i + 1) % PREDICTION_HISTORY_SIZE
+        if self._hist_count < PREDICTION_HISTORY_SIZE:
+            self._hist_count += 1
         
     async def update_with_outcome(self, token_address: str, 
                                  actual_return: float, actual_hold_time: int):
         """
         Aktualisiert Model mit tatsächlichem Outcome
         """
-        # Finde entsprechende Prediction
-        for pred in self.prediction_history:
-            if pred['prediction']['token_address'] == token_address:
-                # Füge Outcome hinzu
-                pred['actual_return'] = actual_return
-                pred['actual_hold_time'] = actual_hold_time
-                
-                # Füge zu Training Samples hinzu
-                self.new_samples.append(pred)
+        if not self._ready.is_set():
+            await self.initialize()
+            
+        # Finde entsprechende Prediction (vektorisierte Suche, jüngste zuerst)
+        matches = np.flatnonzero(self._hist_addr == token_address)
+        if matches.size == 0:
+            return
+        i = matches[np.argmin((self._hist_idx - 1 - matches) % PREDICTION_HISTORY_SIZE)]
+        
+        # Füge Outcome hinzu
+        self._hist_actual[i] = (actual_return, actual_hold_time)
+        
+        # Füge zu Training Samples hinzu: (features, actual_return, actual_hold_time)
+        sample = (self._hist_feat[i].copy(), actual_return, actual_hold_time)
+        self.new_samples.append(sample)
+        
+        # Schneller Pfad: inkrementelles Update pro Sample
+        self._partial_update(sample)
+        
+        # Langsamer Pfad: Tree Models periodisch neu fitten
+        if (not self._retraining and
+                len(self.new_samples) >= self.retrain_threshold and
+                time.time() - self._last_tree_fit >= self.tree_refit_interval):
+            await self.retrain_models()
                 
-                # Retrain wenn genug neue Samples
-                if len(self.new_samples) >= self.retrain_threshold:
-                    await self.retrain_models()
-                    
-                break
+    def _partial_update(self, sample: Tuple):
+        """
+        Online Learning - partial_fit der SGD Models auf dem Residual der Trees
+        """
+        try:
+            feature_values, actual_return, actual_hold_time = sample
+            x = np.array([feature_values], dtype=np.float32)
+            X_scaled = self._scale(x)
+            
+            # Mean/Varianz inkrementell nachführen (konstanter Speicher)
+            self.online_scaler.partial_fit(x)
+            X_online = self.online_scaler.transform(x)
+            
+            targets = {
+                'returns': actual_return,
+                'risk': 1.0 if actual_return < -10 else 0.0,  # Risk indicator
+                'timing': actual_hold_time
+            }
+            
+            for name, target in targets.items():
+                residual = target - self._predict_tree(name, X_scaled)[0]
+                self.online_models[name].partial_fit(X_online, [residual])
                 
+            self._online_ready = True
+            
+        except Exception as e:
+            print(f"Online Update Error: {e}")
+            
     async def retrain_models(self):
         """
-        Online Learning - Retraining mit neuen Daten
+        Periodischer Re-Fit der Tree Models (im Executor, blockiert nicht den Event Loop)
         """
+        if self._retraining:
+            return
+        self._retraining = True
+        
         print("🔄 Retraining ML Models mit neuen Daten...")
         
+        # Snapshot vor dem await - Outcomes während des Fits landen in der neuen Liste
+        samples, self.new_samples = self.new_samples, []
+        swapped = False
+        
         try:
             # Konvertiere zu Training Data
             X = []
@@ -473,68 +764,82 @@ class MLPredictor:
             y_risk = []
             y_timing = []
             
-            for sample in self.new_samples:
-                features = TokenFeatures(**sample['features'])
-                X.append(features.to_array())
-                y_returns.append(sample['actual_return'])
-                y_risk.append(1 if sample['actual_return'] < -10 else 0)  # Risk indicator
-                y_timing.append(sample['actual_hold_time'])
-                
-            X = np.array(X)
-            
-            # Incremental Learning
-            if hasattr(self.models['returns'], 'partial_fit'):
-                # Für SGD-basierte Models
-                self.models['returns'].partial_fit(X, y_returns)
-                self.models['risk'].partial_fit(X, y_risk)
-                self.models['timing'].partial_fit(X, y_timing)
-            else:
-                # Für Tree-basierte Models: Combine mit alten Daten und retrain
-                # Lade alte Training Data
-                old_X, old_y = await self._load_training_data()
+            for feature_values, actual_return, actual_hold_time in samples:
+                X.append(feature_values)
+                y_returns.append(actual_return)
+                y_risk.append(1 if actual_return < -10 else 0)  # Risk indicator
+                y_timing.append(actual_hold_time)
                 
-                if old_X is not None:
-                    X = np.vstack([old_X, X])
-                    y_returns = np.concatenate([old_y['returns'], y_returns])
-                    y_risk = np.concatenate([old_y['risk'], y_risk])
-                    y_timing = np.concatenate([old_y['timing'], y_timing])
-                    
-                # Retrain
-                self.models['returns'].fit(self.scaler.fit_transform(X), y_returns)
-                self.models['risk'].fit(self.scaler.transform(X), y_risk)
-                self.models['timing'].fit(self.scaler.transform(X), y_timing)
+            X = np.ascontiguousarray(X, dtype=np.float32)
+            scaler, models, X_scaled = await asyncio.get_running_loop().run_in_executor(
+                None, self._fit_tree_models, X, y_returns, y_risk, y_timing
+            )
+            
+            # Atomarer Austausch - Residuals der alten Trees sind nicht mehr gültig
+            self._set_scaler(scaler)
+            self.models = models
+            self._compiled = {}
+            self._ort = {}
+            self._reset_online()
+            self._last_tree_fit = time.time()
+            swapped = True
                 
             # Update Feature Importance
             self._update_feature_importance()
             
+            # Neu kompilieren, sonst liefern die alten Predictors weiter Ergebnisse
+            await self._compile_models(X_scaled)
+            
             # Save Updated Models
             await self.save_models()
             
-            # Clear new samples
-            self.new_samples = []
-            
             print("✅ Models erfolgreich aktualisiert")
             
         except Exception as e:
             print(f"Retraining Error: {e}")
+            # Snapshot nicht verlieren, falls der Fit selbst gescheitert ist
+            if not swapped:
+                self.new_samples = samples + self.new_samples
+        finally:
+            self._retraining = False
             
+    def _fit_tree_models(self, X: np.ndarray, y_returns, y_risk,
+                         y_timing) -> Tuple[StandardScaler, Dict, np.ndarray]:
+        """
+        Fittet Kopien von Scaler und Tree Models - laufende Predictions nutzen weiter die alten
+        """
+        # Scaler-Statistik inkrementell erweitern statt auf gestapelter Historie neu zu fitten
+        scaler = copy.deepcopy(self.scaler)
+        scaler.partial_fit(X)
+        # Matrix nur einmal skalieren, alle Models teilen X_scaled
+        X_scaled = scaler.transform(X)
+        
+        models = {name: clone(model) for name, model in self.models.items()}
+        self._fit_parallel(models['returns'], X_scaled, y_returns)
+        self._fit_parallel(models['risk'], X_scaled, y_risk)
+        self._fit_parallel(models['timing'], X_scaled, y_timing)
+        return scaler, models, X_scaled
+        
+    @staticmethod
+    def _fit_parallel(model, X_scaled: np.ndarray, y):
+        """
+        Fit auf allen Cores, Predict danach single-threaded - Micro-Batches sind zu klein
+        für den joblib Thread-Pool und würden mit dem Event Loop um Cores konkurrieren
+        """
+        parallel = 'n_jobs' in model.get_params()
+        if parallel:
+            model.set_params(n_jobs=-1)
+        model.fit(X_scaled, y)
+        if parallel:
+            model.set_params(n_jobs=1)
+        
     def _update_feature_importance(self):
         """
         Aktualisiert Feature Importance Scores
         """
         if hasattr(self.models['returns'], 'feature_importances_'):
-            feature_names = [
-                'liquidity_usd', 'liquidity_change_5m', 'market_cap', 'age_minutes',
-                'holder_count', 'holder_growth_rate', 'top_10_percentage', 'distribution_score',
-                'volume_5m', 'volume_1h', 'volume_liquidity_ratio', 'buy_sell_ratio',
-                'price_change_5m', 'price_change_1h', 'volatility', 'momentum_score',
-                'tx_count_5m', 'avg_tx_size', 'large_tx_ratio', 'unique_traders',
-                'rsi', 'volume_weighted_price', 'price_acceleration',
-                'hour_of_day', 'day_of_week', 'is_weekend', 'network_congestion', 'gas_price'
-            ]
-            
             importances = self.models['returns'].feature_importances_
-            self.feature_importance = dict(zip(feature_names, importances))
+            self.feature_importance = dict(zip(FEATURE_NAMES, importances))
             
             # Print Top 10 Features
             top_features = sorted(self.feature_importance.items(), 
@@ -549,7 +854,7 @@ class MLPredictor:
         """
         # Generate synthetic training data
         n_samples = 1000
-        X = np.random.randn(n_samples, 28)  # 28 features
+        X = np.random.randn(n_samples, NUM_FEATURES).astype(np.float32)
         
         # Synthetic targets mit realistischen Patterns
         y_returns = np.random.normal(20, 50, n_samples)  # Returns centered at 20%
@@ -558,6 +863,7 @@ class MLPredictor:
         
         # Scale features
         X_scaled = self.scaler.fit_transform(X)
+        self._set_scaler(self.scaler)
         
         # Train Models
         self.models['returns'] = GradientBoostingRegressor(
@@ -581,9 +887,15 @@ class MLPredictor:
         )
         
         # Fit models
-        self.models['returns'].fit(X_scaled, y_returns)
-        self.models['risk'].fit(X_scaled, y_risk)
-        self.models['timing'].fit(X_scaled, y_timing)
+        self._fit_parallel(self.models['returns'], X_scaled, y_returns)
+        self._fit_parallel(self.models['risk'], X_scaled, y_risk)
+        self._fit_parallel(self.models['timing'], X_scaled, y_timing)
+        
+        # Online Models starten frisch auf den neuen Trees
+        self._reset_online()
+        self._last_tree_fit = time.time()
+        
+        await self._compile_models(X_scaled)
         
         # Save models
         await self.save_models()
@@ -594,12 +906,26 @@ class MLPredictor:
         """
         Speichert Models auf Disk
         """
+        # Lazy Imports - nur im seltenen I/O Pfad benötigt
+        import joblib
+        import aiofiles
+        
         try:
             # Save models
             joblib.dump(self.models['returns'], f"{self.model_dir}/returns_model.pkl")
             joblib.dump(self.models['risk'], f"{self.model_dir}/risk_model.pkl")
             joblib.dump(self.models['timing'], f"{self.model_dir}/timing_model.pkl")
             joblib.dump(self.scaler, f"{self.model_dir}/scaler.pkl")
+            online_path = f"{self.model_dir}/online_models.pkl"
+            if self._online_ready:
+                joblib.dump((self.online_scaler, self.online_models), online_path)
+            elif os.path.exists(online_path):
+                # Residuals gehören zu alten Trees
+                os.remove(online_path)
+                
+            # ONNX Export für schnellen Start und Inferenz über ONNX Runtime
+            if ONNX_AVAILABLE:
+                await self._export_onnx()
             
             # Save metadata
             metadata = {
@@ -620,10 +946,25 @@ class MLPredictor:
         """
         Lädt Models von Disk
         """
+        # Lazy Imports - nur im seltenen I/O Pfad benötigt
+        import joblib
+        import aiofiles
+        
         self.models['returns'] = joblib.load(f"{self.model_dir}/returns_model.pkl")
         self.models['risk'] = joblib.load(f"{self.model_dir}/risk_model.pkl")
         self.models['timing'] = joblib.load(f"{self.model_dir}/timing_model.pkl")
-        self.scaler = joblib.load(f"{self.model_dir}/scaler.pkl")
+        self._set_scaler(joblib.load(f"{self.model_dir}/scaler.pkl"))
+        
+        # Online Models sind optional (erst nach dem ersten Outcome vorhanden)
+        online_path = f"{self.model_dir}/online_models.pkl"
+        if os.path.exists(online_path):
+            self.online_scaler, self.online_models = joblib.load(online_path)
+            self._online_ready = True
+        else:
+            self._reset_online()
+            
+        if ONNX_AVAILABLE:
+            await self._load_onnx_sessions()
         
         # Load metadata
         async with aiofiles.open(f"{self.model_dir}/metadata.json", 'r') as f:
@@ -631,16 +972,67 @@ class MLPredictor:
             self.feature_importance = metadata.get('feature_importance', {})
             self.model_performance = metadata.get('model_performance', {})
             
-    async def _load_training_data(self) -> Tuple[Optional[np.ndarray], Optional[Dict]]:
+    async def _export_onnx(self):
         """
-        Lädt gespeicherte Training Data
+        Exportiert die Tree Models als ONNX Graph (Input: skalierte float32 Features).
+        Konvertierung und Session-Aufbau laufen im Executor, blockieren nicht den Event Loop
         """
-        try:
-            # Würde von Disk/Database geladen
-            return None, None
-        except:
-            return None, None
-            
+        models = self.models
+        sessions = await asyncio.get_running_loop().run_in_executor(
+            None, self._write_onnx_sessions, models
+        )
+        # Nur übernehmen, wenn inzwischen kein neueres Model aktiv ist
+        if self.models is models:
+            self._ort = sessions
+        
+    def _write_onnx_sessions(self, models: Dict) -> Dict:
+        """
+        Schreibt die ONNX Graphen und öffnet danach die Sessions (läuft im Executor)
+        """
+        initial_types = [('X', FloatTensorType([None, NUM_FEATURES]))]
+        for name, model in models.items():
+            path = f"{self.model_dir}/{name}_model.onnx"
+            try:
+                onx = convert_sklearn(model, initial_types=initial_types)
+                with open(path, 'wb') as f:
+                    f.write(onx.SerializeToString())
+            except Exception as e:
+                print(f"ONNX Export Error ({name}): {e}")
+                # Kein veralteter Graph eines alten Models
+                if os.path.exists(path):
+                    os.remove(path)
+                
+        return self._open_onnx_sessions(models)
+        
+    async def _load_onnx_sessions(self):
+        """
+        Öffnet ONNX Runtime Sessions für alle exportierten Models (im Executor)
+        """
+        models = self.models
+        sessions = await asyncio.get_running_loop().run_in_executor(
+            None, self._open_onnx_sessions, models
+        )
+        # Atomarer Austausch wie bei den Treelite Predictors
+        if self.models is models:
+            self._ort = sessions
+        
+    def _open_onnx_sessions(self, models: Dict) -> Dict:
+        """
+        Erstellt die InferenceSessions für alle vorhandenen ONNX Graphen
+        """
+        sessions = {}
+        for name in models:
+            path = f"{self.model_dir}/{name}_model.onnx"
+            if not os.path.exists(path):
+                continue
+            try:
+                sessions[name] = onnxruntime.InferenceSession(
+                    path, providers=['CPUExecutionProvider']
+                )
+            except Exception as e:
+                print(f"ONNX Load Error ({name}): {e}")
+        return sessions
+        
     def _fallback_prediction(self, metrics: Dict) -> PredictionResult:
         """
         Fallback wenn ML fehlschlägt
@@ -676,41 +1068,34 @@ class MLPredictor:
         """
         Gibt Model Performance Metrics zurück
         """
-        if len(self.prediction_history) < 10:
+        if self._hist_count < 10:
             return self.model_performance
             
         # Calculate performance metrics
-        predictions_with_outcome = [
-            p for p in self.prediction_history 
-            if 'actual_return' in p
-        ]
+        has_outcome = ~np.isnan(self._hist_actual[:, 0])
+        n = int(np.count_nonzero(has_outcome))
         
-        if predictions_with_outcome:
-            predicted = [p['prediction']['predicted_return'] for p in predictions_with_outcome]
-            actual = [p['actual_return'] for p in predictions_with_outcome]
+        if n:
+            predicted = self._hist_pred[has_outcome, 0].astype(np.float64)
+            actual = self._hist_actual[has_outcome, 0].astype(np.float64)
             
             # Correlation
-            if len(predicted) > 1:
-                correlation = np.corrcoef(predicted, actual)[0, 1]
+            if n > 1:
+                correlation = float(np.corrcoef(predicted, actual)[0, 1])
                 self.model_performance['profit_correlation'] = correlation
                 
             # Accuracy (within 20% error)
-            accurate = sum(
-                1 for p, a in zip(predicted, actual)
-                if abs(p - a) / max(abs(a), 1) < 0.2
-            )
-            self.model_performance['accuracy'] = accurate / len(predicted)
+            error = np.abs(predicted - actual) / np.maximum(np.abs(actual), 1.0)
+            self.model_performance['accuracy'] = float(np.mean(error < 0.2))
             
             # Directional Accuracy
-            direction_correct = sum(
-                1 for p, a in zip(predicted, actual)
-                if (p > 0 and a > 0) or (p <= 0 and a <= 0)
+            self.model_performance['direction_accuracy'] = float(
+                np.mean((predicted > 0) == (actual > 0))
             )
-            self.model_performance['direction_accuracy'] = direction_correct / len(predicted)
             
         return self.model_performance
 
-# Global Instance
+# Global Instance (initialisiert sich beim ersten Aufruf im laufenden Event Loop)
 ml_predictor = MLPredictor()
 
 # Public API
@@ -3,17 +3,24 @@
 Ultra-Fast WebSocket Scanner mit Priorisierung und Batch-Processing
 """
 import asyncio
-import json
+import orjson
 import websockets
 import time
-from typing import Dict, Set, List
-from collections import deque
+from typing import Dict, List, NamedTuple
+from collections import deque, OrderedDict
 from dataclasses import dataclass, field
 import heapq
+from solders.pubkey import Pubkey
+try:
+    # SIMD JSON Parser (simdjson) - eine wiederverwendete Parser-Instanz
+    import cysimdjson
+    _PARSER = cysimdjson.JSONParser()
+    SIMDJSON_AVAILABLE = True
+except ImportError:
+    SIMDJSON_AVAILABLE = False
 
 from config import DEXSCREENER_WSS_URL, ENABLE_SNIPING_MODE
 import analyzer
-import telegram_bot
 
 @dataclass(order=True)
 class PriorityPair:
@@ -22,17 +29,65 @@ class PriorityPair:
     pair_data: Dict = field(compare=False)
     timestamp: float = field(default_factory=time.time, compare=False)
 
+class ScannerSnap(NamedTuple):
+    """Konsistenter Zustand des Scanners für Anzeige/Caching"""
+    running: bool
+    queued: int
+    processed: int
+
+# Wrapped SOL Mint (Pairs mit SOL als Base Token werden übersprungen)
+SOL_MINT = "So11111111111111111111111111111111111111112"
+
+# Max. Anzahl gemerkter Pairs für die Deduplizierung
+MAX_PROCESSED_PAIRS = 50_000
+
+# Subscribe Payloads (einmalig serialisiert, als Text-Frames gesendet)
+_SUB_PAIRS = orjson.dumps({"method": "subscribe", "params": ["newPairs", "solana"]}).decode()
+_SUB_LIQUIDITY = orjson.dumps({"method": "subscribe", "params": ["liquidityEvents", "solana"]}).decode()
+
+# Byte-Marker für das Vorfiltern der Frames
+_PAIR_MARKER = b'"pair"'
+_SOLANA_MARKER = b'"solana"'
+_LIQUIDITY_MARKER = b'"liquidityAdd"'
+
+def _address_key(address: str):
+    """
+    Dedup-Key: rohe 32 Pubkey-Bytes statt 44-Zeichen base58 String
+    (Decoding in Rust via solders). Ungültige Adressen bleiben als String.
+    """
+    try:
+        return bytes(Pubkey.from_string(address))
+    except ValueError:
+        return address
+
+def _to_python(element):
+    """
+    Materialisiert ein simdjson Element als Python Objekt.
+    Nötig für alles, was in die Queue geht - das Dokument ist nur bis zum nächsten parse() gültig.
+    """
+    return element.export() if SIMDJSON_AVAILABLE and hasattr(element, 'export') else element
+
 class HighPerformanceScanner:
     def __init__(self):
-        self.processed_pairs: Set[str] = set()
-        self.processing_queue = asyncio.Queue(maxsize=1000)
-        self.priority_queue: List[PriorityPair] = []
+        # LRU der bereits gesehenen Pairs (begrenzt auf MAX_PROCESSED_PAIRS)
+        self.processed_pairs: OrderedDict = OrderedDict()
+        # Priority Queue: Binary Heap (heapq) unter einer Condition - höchste Priorität zuerst
+        self._heap: List[PriorityPair] = []
+        self._cv = asyncio.Condition()
+        self._size_cap = 1000
+        # Pro Worker eine private Deque + Event, befüllt vom Dispatcher
+        self._worker_queues: List[deque] = []
+        self._worker_events: List[asyncio.Event] = []
+        # Indizes der Worker, die auf eine Zuteilung warten (FIFO), gesetzt solange nicht leer
+        self._free: deque = deque()
+        self._idle = asyncio.Event()
         self.workers: List[asyncio.Task] = []
         self.stats = {
             'received': 0,
             'processed': 0,
             'filtered': 0,
-            'alerts_sent': 0
+            'alerts_sent': 0,
+            'dropped': 0
         }
         self.running = False
         
@@ -43,9 +98,14 @@ class HighPerformanceScanner:
         # Starte Worker für parallele Verarbeitung
         num_workers = 5  # 5 parallele Analyzer
         for i in range(num_workers):
-            worker = asyncio.create_task(self._process_worker(f"Worker-{i}"))
+            self._worker_queues.append(deque())
+            self._worker_events.append(asyncio.Event())
+            worker = asyncio.create_task(self._process_worker(i))
             self.workers.append(worker)
             
+        # Dispatcher verteilt die Top-K Pairs mit einem Lock-Zugriff
+        self.workers.append(asyncio.create_task(self._dispatcher()))
+            
         # Starte Stats Reporter
         asyncio.create_task(self._stats_reporter())
         
@@ -54,19 +114,11 @@ class HighPerformanceScanner:
         
     async def _websocket_loop(self):
         """Haupt WebSocket Loop mit Auto-Reconnect"""
-        subscribe_messages = [
-            {
-                "method": "subscribe",
-                "params": ["newPairs", "solana"]
-            }
-        ]
+        subscribe_messages = [_SUB_PAIRS]
         
         # Im Sniping Mode auch auf Liquidity Events hören
         if ENABLE_SNIPING_MODE:
-            subscribe_messages.append({
-                "method": "subscribe", 
-                "params": ["liquidityEvents", "solana"]
-            })
+            subscribe_messages.append(_SUB_LIQUIDITY)
         
         backoff = 1
         
@@ -76,20 +128,26 @@ class HighPerformanceScanner:
                     DEXSCREENER_WSS_URL,
                     ping_interval=20,
                     ping_timeout=10,
-                    close_timeout=10
+                    close_timeout=10,
+                    compression=None,  # Kein permessage-deflate (zlib inflate pro Frame)
+                    max_size=8 * 1024 * 1024,
+                    read_limit=1024 * 1024  # Größerer Lesepuffer für Bursts
                 ) as websocket:
                     
                     print(f"✅ WebSocket verbunden. Subscribing zu {len(subscribe_messages)} Events...")
                     
                     # Subscribe zu allen Events
+                    send = websocket.send
                     for msg in subscribe_messages:
-                        await websocket.send(json.dumps(msg))
+                        await send(msg)
                     
                     backoff = 1  # Reset backoff bei erfolgreicher Verbindung
                     
-                    # Message Processing Loop
+                    # Message Processing Loop - inline statt einem Task pro Frame,
+                    # die langsame Analyse läuft ohnehin in den Workern
+                    handle = self._handle_message
                     async for message in websocket:
-                        asyncio.create_task(self._handle_message(message))
+                        await handle(message)
                         
             except websockets.exceptions.ConnectionClosed as e:
                 print(f"⚠️ WebSocket Verbindung geschlossen: {e}")
@@ -105,53 +163,120 @@ class HighPerformanceScanner:
     async def _handle_message(self, message: str):
         """Verarbeitet eingehende WebSocket Messages"""
         try:
-            data = json.loads(message)
             self.stats['received'] += 1
+            raw = message if isinstance(message, (bytes, bytearray)) else message.encode()
+            
+            # Substring-Gate (memchr-schnell): Frames ohne Solana-Pair oder
+            # Liquidity Event werden verworfen, bevor der Parser sie anfasst
+            if not ((_PAIR_MARKER in raw and _SOLANA_MARKER in raw) or
+                    (ENABLE_SNIPING_MODE and _LIQUIDITY_MARKER in raw)):
+                return
+                
+            if SIMDJSON_AVAILABLE:
+                # Lazy Dokument - Felder werden erst beim Zugriff gelesen
+                data = _PARSER.parse(raw)
+            else:
+                data = orjson.loads(raw)
             
             # Verschiedene Event Types
             event_type = data.get('type', '')
             
             if event_type == 'pair' and data.get('network') == 'solana':
-                await self._handle_new_pair(data.get('pair', {}))
+                # Ein Zeitstempel pro Message für Priorität und Queue-Eintrag
+                await self._handle_new_pair(_to_python(data.get('pair', {})), time.time())
                 
             elif event_type == 'liquidityAdd' and ENABLE_SNIPING_MODE:
                 # Liquidity Add Events für Ultra-Early Detection
-                await self._handle_liquidity_event(data)
+                await self._handle_liquidity_event(_to_python(data))
                 
-        except json.JSONDecodeError:
+        except ValueError:
+            # JSON Parse Fehler (orjson/simdjson)
             pass
         except Exception as e:
             print(f"Message Handler Fehler: {e}")
             
-    async def _handle_new_pair(self, pair_data: Dict):
+    async def _handle_new_pair(self, pair_data: Dict, now: float):
         """Verarbeitet neue Pair Events"""
         if not pair_data:
             return
             
         pair_address = pair_data.get('pairAddress', '')
-        if not pair_address or pair_address in self.processed_pairs:
+        if not pair_address:
+            return
+        pair_key = _address_key(pair_address)
+        if pair_key in self.processed_pairs:
+            self.processed_pairs.move_to_end(pair_key)
             return
             
         # Skip SOL selbst
         base_token = pair_data.get('baseToken', {}).get('address', '')
-        if base_token == "So11111111111111111111111111111111111111112":
+        if base_token == SOL_MINT:
             return
             
-        self.processed_pairs.add(pair_address)
-        
-        # Schnelle Vor-Priorisierung basierend auf Liquidität
-        liquidity = float(pair_data.get('liquidity', {}).get('usd', 0))
+        self.processed_pairs[pair_key] = None
+        if len(self.processed_pairs) > MAX_PROCESSED_PAIRS:
+            self.processed_pairs.popitem(last=False)
         
         # Priority Score (höher = besser)
-        priority = self._calculate_priority(pair_data)
+        priority = self._calculate_priority(pair_data, now)
         
         # In Priority Queue einreihen
         priority_pair = PriorityPair(
             priority=-priority,  # Negative für Max-Heap Verhalten
-            pair_data=pair_data
+            pair_data=pair_data,
+            timestamp=now
         )
         
-        await self.processing_queue.put(priority_pair)
+        await self._push(priority_pair)
+        
+    async def _push(self, item: PriorityPair):
+        """Reiht ein Pair in den Heap ein, bei voller Queue wird das schwächste verdrängt"""
+        async with self._cv:
+            heap = self._heap
+            if len(heap) < self._size_cap:
+                heapq.heappush(heap, item)
+            else:
+                # Schwächstes Element liegt immer in der Blatt-Hälfte des Heaps
+                worst = max(range(len(heap) // 2, len(heap)), key=heap.__getitem__)
+                self.stats['dropped'] += 1
+                if not item < heap[worst]:
+                    return
+                heap[worst] = item
+                heapq.heapify(heap)
+            self._cv.notify()
+            
+    async def _batch_pop(self, k: int) -> List[PriorityPair]:
+        """Wartet auf Pairs und entnimmt die Top-K in einem kritischen Abschnitt"""
+        async with self._cv:
+            await self._cv.wait_for(lambda: self._heap)
+            heap = self._heap
+            return [heapq.heappop(heap) for _ in range(min(k, len(heap)))]
+            
+    async def _dispatcher(self):
+        """Verteilt Pairs an freie Worker - max. ein Pair pro Worker-Deque, damit
+        neue Pairs mit höherer Priorität nicht hinter bereits verteilten warten"""
+        free = self._free
+        while self.running:
+            await self._idle.wait()
+            
+            # Nur Worker hier melden sich selbst frei - während des Wartens kommen höchstens welche dazu
+            batch = await self._batch_pop(len(free))
+            for item in batch:
+                i = free.popleft()
+                self._worker_queues[i].append(item)
+                self._worker_events[i].set()
+            
+            # Weiter verteilen solange noch Worker frei sind
+            if not free:
+                self._idle.clear()
+            
+    def qsize(self) -> int:
+        """Anzahl wartender Pairs"""
+        return len(self._heap) + sum(map(len, self._worker_queues))
+
+    def snapshot(self) -> ScannerSnap:
+        """Status, Queue-Größe und Processed-Zähler in einem Aufruf"""
+        return ScannerSnap(self.running, self.qsize(), self.stats['processed'])
         
     async def _handle_liquidity_event(self, event_data: Dict):
         """Verarbeitet Liquidity Events für frühe Erkennung"""
@@ -159,74 +284,72 @@ class HighPerformanceScanner:
         # Kann Token erkennen bevor sie auf DexScreener erscheinen
         pass
         
-    def _calculate_priority(self, pair_data: Dict) -> float:
+    def _calculate_priority(self, pair_data: Dict, now: float) -> float:
         """
         Berechnet Priorität für Processing Queue
         Höhere Werte = höhere Priorität
         """
-        priority = 0.0
+        # Felder einmal extrahieren
+        liquidity = float(pair_data.get('liquidity', {}).get('usd', 0) or 0)
+        age_ms = now * 1000 - pair_data.get('pairCreatedAt', 0)
+        volume = float(pair_data.get('volume', {}).get('m5', 0) or 0)
+        tx_count = int(pair_data.get('txns', {}).get('m5', {}).get('buys', 0) or 0)
         
-        # Liquidität (Sweet Spot: 10k-50k)
-        liquidity = float(pair_data.get('liquidity', {}).get('usd', 0))
-        if 10000 <= liquidity <= 50000:
-            priority += 50
-        elif 5000 <= liquidity <= 100000:
-            priority += 25
-            
-        # Alter (je neuer desto besser)
-        age_ms = time.time() * 1000 - pair_data.get('pairCreatedAt', 0)
-        if age_ms < 60000:  # < 1 Minute
-            priority += 40
-        elif age_ms < 300000:  # < 5 Minuten
-            priority += 20
-            
-        # Volume (frühe Aktivität ist gut)
-        volume = float(pair_data.get('volume', {}).get('m5', 0))
-        if volume > 10000:
-            priority += 30
-        elif volume > 5000:
-            priority += 15
-            
-        # Transaction Count
-        tx_count = int(pair_data.get('txns', {}).get('m5', {}).get('buys', 0))
-        if tx_count > 20:
-            priority += 20
-        elif tx_count > 10:
-            priority += 10
-            
-        return priority
+        # Branchless: gestaffelte Schwellen als Summe von (Bedingung * Gewicht)
+        return float(
+            # Liquidität (Sweet Spot: 10k-50k = 50, sonst 5k-100k = 25)
+            25 * (5000 <= liquidity <= 100000) + 25 * (10000 <= liquidity <= 50000)
+            # Alter (< 1 Minute = 40, < 5 Minuten = 20)
+            + 20 * (age_ms < 60000) + 20 * (age_ms < 300000)
+            # Volume (frühe Aktivität ist gut: > 10k = 30, > 5k = 15)
+            + 15 * (volume > 10000) + 15 * (volume > 5000)
+            # Transaction Count (> 20 = 20, > 10 = 10)
+            + 10 * (tx_count > 20) + 10 * (tx_count > 10)
+        )
         
-    async def _process_worker(self, worker_name: str):
+    async def _process_worker(self, index: int):
         """Worker Thread für Pair Processing"""
+        worker_name = f"Worker-{index}"
+        queue = self._worker_queues[index]
+        event = self._worker_events[index]
+        clock = asyncio.get_running_loop().time  # Monotonic Clock
+        stats = self.stats
+        free = self._free
+        idle = self._idle
+        pop = queue.popleft
+        
+        # Try using integration layer first (includes AI & Auto-Trading),
+        # einmal pro Worker aufgelöst statt Import pro Pair
+        try:
+            from integration import process_token as analyze
+        except ImportError:
+            # Fallback to traditional analyzer
+            analyze = analyzer.analyze_streamed_pair
+            
         print(f"🚀 {worker_name} gestartet")
         
         while self.running:
             try:
-                # Warte auf nächstes Pair mit Timeout
-                priority_pair = await asyncio.wait_for(
-                    self.processing_queue.get(), 
-                    timeout=1.0
-                )
+                # Leer: beim Dispatcher frei melden und auf Zuteilung warten
+                # (stop() bricht Worker ab)
+                if not queue:
+                    event.clear()
+                    free.append(index)
+                    idle.set()
+                    await event.wait()
+                    continue
+                    
+                priority_pair = pop()
                 
                 # Analysiere Pair (mit Integration Layer)
-                start_time = time.time()
-
-                # Try using integration layer first (includes AI & Auto-Trading)
-                try:
-                    from integration import process_token
-                    await process_token(priority_pair.pair_data)
-                except ImportError:
-                    # Fallback to traditional analyzer
-                    await analyzer.analyze_streamed_pair(priority_pair.pair_data)
-
-                process_time = time.time() - start_time
-                self.stats['processed'] += 1
+                start_time = clock()
+                await analyze(priority_pair.pair_data)
+                process_time = clock() - start_time
+                stats['processed'] += 1
                 
                 if process_time > 1:
                     print(f"⚠️ Langsame Analyse: {process_time:.2f}s")
                     
-            except asyncio.TimeoutError:
-                continue
             except Exception as e:
                 print(f"Worker {worker_name} Fehler: {e}")
                 
@@ -235,17 +358,21 @@ class HighPerformanceScanner:
         while self.running:
             await asyncio.sleep(60)  # Jede Minute
             
+            # Snapshot nehmen und genau diesen abziehen - kein Inkrement geht verloren
+            stats = self.stats
+            received = stats['received']
+            processed = stats['processed']
+            
             print(f"""
             📊 Scanner Statistiken (1 Min):
-            Empfangen: {self.stats['received']}
-            Verarbeitet: {self.stats['processed']}
-            Queue: {self.processing_queue.qsize()}
+            Empfangen: {received}
+            Verarbeitet: {processed}
+            Queue: {self.qsize()}
             Cache: {len(self.processed_pairs)} Pairs
             """)
             
-            # Reset Stats
-            self.stats['received'] = 0
-            self.stats['processed'] = 0
+            stats['received'] -= received
+            stats['processed'] -= processed
             
     async def stop(self):
         """Stoppt Scanner sauber"""
@@ -5,10 +5,13 @@ Alle Trading-Parameter über interaktive Buttons steuerbar
 """
 import os
 import asyncio
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Mapping
+from types import MappingProxyType
 from datetime import datetime
 import json
+from html import escape
 import time
+from collections import deque, OrderedDict
 
 from telegram import (
     Update, InlineKeyboardButton, InlineKeyboardMarkup,
@@ -19,6 +22,8 @@ from telegram.ext import (
     ContextTypes, MessageHandler, filters
 )
 from telegram.constants import ParseMode
+from telegram.error import BadRequest, RetryAfter
+from telegram.request import HTTPXRequest
 
 # Import Bot Components
 import trader
@@ -32,6 +37,16 @@ import config as cfg
 # Bot Instance
 telegram_app: Application = None
 bot_instance: Bot = None
+_chat_id: str = None
+
+# Eager Tasks (Python 3.12+) nur für kurze Hot-Path Tasks, nicht loop-weit
+_EAGER_TASK_FACTORY = getattr(asyncio, 'eager_task_factory', None)
+
+def _create_eager_task(coro) -> asyncio.Task:
+    """Task, der bis zum ersten await sofort läuft (ohne Scheduler-Runde), sonst normal"""
+    if _EAGER_TASK_FACTORY is not None:
+        return _EAGER_TASK_FACTORY(asyncio.get_running_loop(), coro)
+    return asyncio.create_task(coro)
 
 # Dynamic User Settings (Persistent)
 user_settings = {
@@ -77,8 +92,8 @@ user_settings = {
     'show_charts': True
 }
 
-# Trade History
-trade_history = []
+# Trade History (letzte 100 Trades, älteste fallen automatisch raus)
+trade_history = deque(maxlen=100)
 
 # Performance Tracking
 bot_stats = {
@@ -87,9 +102,287 @@ bot_stats = {
     'total_scanned': 0,
     'total_trades': 0,
     'winning_trades': 0,
-    'total_profit_sol': 0.0
+    'total_profit_sol': 0.0,
+    # Laufende Aggregate (in record_trade aktualisiert)
+    'sum_profit_pct': 0.0,
+    'best_profit_pct': float('-inf'),
+    'dropped_alerts': 0,
+    'duplicate_alerts': 0
 }
 
+# ============================================================================
+# OUTGOING RATE LIMIT (Telegram erlaubt global ~30 msg/s)
+# ============================================================================
+
+SEND_RATE_PER_SEC = 25
+SEND_MAX_RETRIES = 3
+
+# HTTPX Connection Pool (>= gleichzeitige Sends, sonst Pool-Timeouts)
+CONNECTION_POOL_SIZE = 64
+POOL_TIMEOUT = 10.0
+CONNECT_TIMEOUT = 5.0
+
+class _TokenBucket:
+    """Einfacher Token Bucket für ausgehende Nachrichten"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.last = time.monotonic()
+
+    async def acquire(self):
+        """Wartet bis ein Token verfügbar ist"""
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+_SEND_BUCKET = _TokenBucket(rate=SEND_RATE_PER_SEC, capacity=SEND_RATE_PER_SEC)
+
+# Alert Queue - send_message reiht nur ein, ein Worker versendet gebündelt
+ALERT_QUEUE_SIZE = 1000
+ALERT_BATCH_SIZE = 10
+ALERT_SEPARATOR = "\n\n"
+MAX_MESSAGE_LENGTH = 4096  # Telegram Limit pro Nachricht
+alert_queue: asyncio.Queue = asyncio.Queue(maxsize=ALERT_QUEUE_SIZE)
+_alert_worker: asyncio.Task = None
+
+# Duplikat-Filter: identische Alerts innerhalb der TTL nur einmal senden (LRU)
+ALERT_DEDUPE_TTL = 30.0  # Sekunden
+ALERT_DEDUPE_SIZE = 512
+_recent_alerts: "OrderedDict[int, float]" = OrderedDict()
+
+def _is_duplicate_alert(text: str) -> bool:
+    """True wenn derselbe Text innerhalb der TTL schon eingereiht wurde"""
+    seen = _recent_alerts.get(hash(text))
+    return seen is not None and time.monotonic() - seen < ALERT_DEDUPE_TTL
+
+def _remember_alert(text: str):
+    """Merkt einen erfolgreich eingereihten Alert für den Duplikat-Filter"""
+    key = hash(text)
+    _recent_alerts[key] = time.monotonic()
+    _recent_alerts.move_to_end(key)
+    if len(_recent_alerts) > ALERT_DEDUPE_SIZE:
+        _recent_alerts.popitem(last=False)
+
+# Dashboard Render-Cache (fängt schnelles "Refresh"-Tippen ab)
+DASHBOARD_CACHE_TTL = 1.5  # Sekunden
+_dashboard_cache = {'ts': 0.0, 'key': None, 'text': ''}
+
+# ============================================================================
+# MENU KEYBOARDS (einmal gebaut, pro Callback wiederverwendet)
+# ============================================================================
+
+_START_MARKUP = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton("📊 Dashboard", callback_data="dashboard"),
+        InlineKeyboardButton("💼 Positions", callback_data="positions")
+    ],
+    [
+        InlineKeyboardButton("⚙️ Settings", callback_data="settings_main"),
+        InlineKeyboardButton("📈 Analytics", callback_data="analytics")
+    ],
+    [
+        InlineKeyboardButton("🎯 Strategies", callback_data="strategies"),
+        InlineKeyboardButton("🔔 Alerts", callback_data="alerts_config")
+    ],
+    [
+        InlineKeyboardButton("🚀 Quick Trade", callback_data="quick_trade"),
+        InlineKeyboardButton("🛑 Emergency Stop", callback_data="emergency_stop")
+    ],
+    [
+        InlineKeyboardButton("📚 Help", callback_data="help"),
+        InlineKeyboardButton("ℹ️ About", callback_data="about")
+    ]
+])
+
+_DASHBOARD_MARKUP = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton("🔄 Refresh", callback_data="dashboard"),
+        InlineKeyboardButton("⚙️ Settings", callback_data="settings_main")
+    ],
+    [InlineKeyboardButton("⬅️ Back", callback_data="start")]
+])
+
+_SETTINGS_MAIN_MARKUP = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton("🎯 Scanner Filters", callback_data="settings_scanner"),
+        InlineKeyboardButton("💰 Trading", callback_data="settings_trading")
+    ],
+    [
+        InlineKeyboardButton("📊 Profit Strategy", callback_data="settings_profit"),
+        InlineKeyboardButton("🔔 Alerts", callback_data="settings_alerts")
+    ],
+    [
+        InlineKeyboardButton("🚀 Quick Presets", callback_data="settings_presets"),
+        InlineKeyboardButton("🔧 Advanced", callback_data="settings_advanced")
+    ],
+    [
+        InlineKeyboardButton("💾 Save Config", callback_data="settings_save"),
+        InlineKeyboardButton("🔄 Reset", callback_data="settings_reset")
+    ],
+    [InlineKeyboardButton("⬅️ Back", callback_data="start")]
+])
+
+_PRESETS_MARKUP = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton("🔥 AGGRESSIVE", callback_data="preset_aggressive"),
+        InlineKeyboardButton("⚖️ BALANCED", callback_data="preset_balanced")
+    ],
+    [
+        InlineKeyboardButton("🛡 CONSERVATIVE", callback_data="preset_conservative"),
+        InlineKeyboardButton("⚡ SCALPING", callback_data="preset_scalping")
+    ],
+    [
+        InlineKeyboardButton("🎯 SNIPING", callback_data="preset_sniping"),
+        InlineKeyboardButton("💎 HODL", callback_data="preset_hodl")
+    ],
+    [InlineKeyboardButton("⬅️ Back", callback_data="settings_main")]
+])
+
+# Preset Beschreibung (komplett statisch)
+_PRESETS_HELP_TEXT = """
+<b>🚀 QUICK PRESETS</b>
+━━━━━━━━━━━━━━━━━━━━━━━
+
+<b>🔥 AGGRESSIVE</b>
+High risk, high reward. Early entries, larger positions.
+• Risk: ⭐⭐⭐⭐⭐
+• Reward: 5-10x potential
+• Win Rate: ~30-40%
+
+<b>⚖️ BALANCED</b>
+Good risk/reward ratio. Proven approach.
+• Risk: ⭐⭐⭐
+• Reward: 2-3x potential
+• Win Rate: ~50-60%
+
+<b>🛡 CONSERVATIVE</b>
+Low risk, steady gains. Focus on quality.
+• Risk: ⭐⭐
+• Reward: 1.5-2x potential
+• Win Rate: ~60-70%
+
+<b>⚡ SCALPING</b>
+Quick in/out. Many small profits.
+• Risk: ⭐⭐
+• Reward: 1.2-1.5x potential
+• Win Rate: ~70%+
+
+<b>🎯 SNIPING</b>
+Ultra-early entries. Highest risk/reward.
+• Risk: ⭐⭐⭐⭐⭐
+• Reward: 10-50x potential
+• Win Rate: ~20-30%
+
+<b>💎 HODL</b>
+Long-term holds. Let winners run.
+• Risk: ⭐⭐⭐
+• Reward: 3-5x potential
+• Win Rate: ~40-50%
+
+<i>Select a preset to apply</i>
+    """
+
+# TP-Level Text, neu formatiert nur wenn sich die Levels ändern
+_tp_text_cache = {'levels': None, 'text': ''}
+
+def _get_tp_text() -> str:
+    """Formatierte Take-Profit Levels (gecached)"""
+    levels = tuple(profit_strategy.TAKE_PROFIT_LEVELS)
+    if levels != _tp_text_cache['levels']:
+        _tp_text_cache['levels'] = levels
+        _tp_text_cache['text'] = "\n".join([
+            f"  • {(mult-1)*100:.0f}% profit → Sell {pct*100:.0f}%"
+            for mult, pct in levels
+        ])
+    return _tp_text_cache['text']
+
+# Settings die in den Button-Labels der dynamischen Menüs auftauchen
+_SCANNER_LABEL_KEYS = (
+    'min_liquidity_usd', 'max_liquidity_usd', 'min_age_minutes', 'max_age_minutes',
+    'min_holder_count', 'min_score', 'min_volume_usd', 'max_top_10_percentage'
+)
+_TRADING_LABEL_KEYS = (
+    'auto_buy_enabled', 'base_trade_amount_sol', 'max_trade_amount_sol',
+    'auto_buy_min_score', 'max_auto_buy_sol', 'min_slippage_bps',
+    'max_slippage_bps', 'use_mev_protection'
+)
+_PROFIT_LABEL_KEYS = (
+    'initial_stop_loss', 'trailing_percentage', 'trailing_activation',
+    'max_hold_time_minutes'
+)
+
+# Vorformatierte Anzeige-Werte (Tausender-Trennzeichen, bps -> %),
+# aktualisiert in update_global_config statt bei jedem Render
+_USD_SETTINGS = ('min_liquidity_usd', 'max_liquidity_usd', 'min_volume_usd')
+_BPS_SETTINGS = ('min_slippage_bps', 'max_slippage_bps')
+_settings_fmt: Dict[str, str] = {}
+
+def _refresh_settings_fmt():
+    """Anzeige-Strings aus user_settings neu berechnen"""
+    for key in _USD_SETTINGS:
+        _settings_fmt[key] = f"${user_settings[key]:,}"
+    for key in _BPS_SETTINGS:
+        _settings_fmt[key] = f"{user_settings[key]/100}%"
+
+_refresh_settings_fmt()
+
+# Dynamische Keyboards, Key = (Menü, Label-Werte...)
+_MENU_CACHE: Dict[tuple, InlineKeyboardMarkup] = {}
+
+def _cached_markup(menu: str, label_keys: tuple, build) -> InlineKeyboardMarkup:
+    """Keyboard aus Cache, nur neu bauen wenn sich ein Label-Wert geändert hat"""
+    key = (menu, *[user_settings[k] for k in label_keys])
+    markup = _MENU_CACHE.get(key)
+    if markup is None:
+        markup = _MENU_CACHE[key] = build()
+    return markup
+
+# Zuletzt gerenderter Inhalt pro Nachricht, Key = (chat_id, message_id)
+MAX_RENDER_ENTRIES = 1000
+_LAST_RENDER: Dict[tuple, int] = {}
+
+def _markup_signature(markup: InlineKeyboardMarkup) -> tuple:
+    """Button-Texte und callback_data als hashbares Tupel"""
+    return tuple(
+        (button.text, button.callback_data)
+        for row in markup.inline_keyboard for button in row
+    )
+
+async def _edit_menu(query, text: str, reply_markup: InlineKeyboardMarkup) -> None:
+    """
+    Nachricht editieren - identischen Inhalt (Text + Buttons) gar nicht erst senden,
+    'message is not modified' von Telegram wird geschluckt
+    """
+    message = query.message
+    key = (message.chat_id, message.message_id) if message else (None, query.inline_message_id)
+    fingerprint = hash((text, _markup_signature(reply_markup)))
+    if _LAST_RENDER.get(key) == fingerprint:
+        return
+
+    try:
+        await query.edit_message_text(
+            text,
+            reply_markup=reply_markup,
+            parse_mode=ParseMode.HTML
+        )
+    except BadRequest as e:
+        # Telegram lehnt Edits ohne Änderung ab - Inhalt ist trotzdem aktuell
+        if 'not modified' not in str(e):
+            raise
+
+    if len(_LAST_RENDER) >= MAX_RENDER_ENTRIES:
+        # Älteste Nachricht vergessen (dict behält Einfügereihenfolge)
+        del _LAST_RENDER[next(iter(_LAST_RENDER))]
+    _LAST_RENDER.pop(key, None)
+    _LAST_RENDER[key] = fingerprint
+
 # ============================================================================
 # MAIN MENU & NAVIGATION
 # ============================================================================
@@ -97,68 +390,41 @@ bot_stats = {
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Enhanced Start Command with Main Menu"""
     chat_id = update.effective_chat.id
-
-    keyboard = [
-        [
-            InlineKeyboardButton("📊 Dashboard", callback_data="dashboard"),
-            InlineKeyboardButton("💼 Positions", callback_data="positions")
-        ],
-        [
-            InlineKeyboardButton("⚙️ Settings", callback_data="settings_main"),
-            InlineKeyboardButton("📈 Analytics", callback_data="analytics")
-        ],
-        [
-            InlineKeyboardButton("🎯 Strategies", callback_data="strategies"),
-            InlineKeyboardButton("🔔 Alerts", callback_data="alerts_config")
-        ],
-        [
-            InlineKeyboardButton("🚀 Quick Trade", callback_data="quick_trade"),
-            InlineKeyboardButton("🛑 Emergency Stop", callback_data="emergency_stop")
-        ],
-        [
-            InlineKeyboardButton("📚 Help", callback_data="help"),
-            InlineKeyboardButton("ℹ️ About", callback_data="about")
-        ]
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
+    reply_markup = _START_MARKUP
 
     welcome_text = f"""
-*🤖 Solana Ultra-Speed Trading Bot v2.0*
+<b>🤖 Solana Ultra-Speed Trading Bot v2.0</b>
 
 ━━━━━━━━━━━━━━━━━━━━━━━
-*Status:* {'🟢 ACTIVE' if scanner.running else '🔴 INACTIVE'}
-*Chat ID:* `{chat_id}`
-*Uptime:* {get_uptime()}
-*Positions:* {len(trader.positions)}
+<b>Status:</b> {'🟢 ACTIVE' if scanner.running else '🔴 INACTIVE'}
+<b>Chat ID:</b> <code>{chat_id}</code>
+<b>Uptime:</b> {get_uptime()}
+<b>Positions:</b> {len(trader.trader.positions)}
 ━━━━━━━━━━━━━━━━━━━━━━━
 
-*🎯 Quick Stats:*
+<b>🎯 Quick Stats:</b>
 • Total Alerts: {bot_stats['total_alerts']}
 • Scanned Today: {bot_stats['total_scanned']}
 • Win Rate: {get_win_rate():.1f}%
-• Total P&L: {bot_stats['total_profit_sol']:+.4f} SOL
+• Total P&amp;L: {bot_stats['total_profit_sol']:+.4f} SOL
 
-*🚀 Features:*
+<b>🚀 Features:</b>
 ✅ Real-time WebSocket Scanner
 ✅ Multi-Layer Token Analysis
 ✅ MEV-Protected Trading
 ✅ Smart Position Management
 ✅ Live Configuration
 
-*👇 Choose an option:*
+<b>👇 Choose an option:</b>
     """
 
     if update.callback_query:
-        await update.callback_query.edit_message_text(
-            welcome_text,
-            reply_markup=reply_markup,
-            parse_mode=ParseMode.MARKDOWN
-        )
+        await _edit_menu(update.callback_query, welcome_text, reply_markup)
     else:
         await update.message.reply_text(
             welcome_text,
             reply_markup=reply_markup,
-            parse_mode=ParseMode.MARKDOWN
+            parse_mode=ParseMode.HTML
         )
 
 # ============================================================================
@@ -167,76 +433,67 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
 
 async def dashboard(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Real-time Dashboard with Live Metrics"""
-    from scanner import scanner
+    # Positionen einmal als unveränderlichen Snapshot lesen (Trader Coroutinen
+    # können währenddessen Positionen öffnen/schließen)
+    symbols, profit_pct, total_invested, total_current_value = trader.trader.get_portfolio_summary()
+
+    # Unveränderter Zustand innerhalb der TTL -> gerenderten Text wiederverwenden
+    now = time.time()
+    snap = scanner.snapshot()
+    key = (len(symbols), snap, bot_stats['total_trades'], bot_stats['total_profit_sol'])
+    if key == _dashboard_cache['key'] and now - _dashboard_cache['ts'] < DASHBOARD_CACHE_TTL:
+        await _edit_menu(update.callback_query, _dashboard_cache['text'], _DASHBOARD_MARKUP)
+        return
 
     # Calculate metrics
-    uptime_hours = (time.time() - bot_stats['start_time']) / 3600
+    uptime_hours = (now - bot_stats['start_time']) / 3600
     win_rate = get_win_rate()
     avg_profit = get_avg_profit()
 
-    # Active positions summary
-    positions_text = ""
-    total_invested = 0
-    total_current_value = 0
-
-    for addr, pos in trader.positions.items():
-        profit_pct = ((pos.current_price - pos.entry_price) / pos.entry_price) * 100 if pos.current_price else 0
-        total_invested += pos.amount_sol
-        total_current_value += pos.amount_sol * (1 + profit_pct/100)
-
-        emoji = "🟢" if profit_pct > 0 else "🔴"
-        positions_text += f"{emoji} `{pos.symbol[:8]}` {profit_pct:+.1f}%\n"
+    # Active positions summary (Aggregate vektorisiert über die SoA Arrays)
+    positions_text = "".join(
+        f"{'🟢' if pct > 0 else '🔴'} <code>{escape(symbol[:8])}</code> {pct:+.1f}%\n"
+        for symbol, pct in zip(symbols, profit_pct.tolist())
+    )
 
     if not positions_text:
-        positions_text = "_No active positions_"
+        positions_text = "<i>No active positions</i>"
 
     dashboard_text = f"""
-*📊 LIVE DASHBOARD*
+<b>📊 LIVE DASHBOARD</b>
 ━━━━━━━━━━━━━━━━━━━━━━━
 
-*🤖 Bot Status*
-• Status: {'🟢 RUNNING' if scanner.running else '🔴 STOPPED'}
+<b>🤖 Bot Status</b>
+• Status: {'🟢 RUNNING' if snap.running else '🔴 STOPPED'}
 • Uptime: {uptime_hours:.1f}h
-• Scanner Queue: {scanner.processing_queue.qsize()}
-• Processed: {scanner.stats['processed']}
+• Scanner Queue: {snap.queued}
+• Processed: {snap.processed}
 
-*💰 Trading Performance*
+<b>💰 Trading Performance</b>
 • Win Rate: {win_rate:.1f}% ({bot_stats['winning_trades']}/{bot_stats['total_trades']})
 • Avg Profit: {avg_profit:+.2f}%
-• Total P&L: {bot_stats['total_profit_sol']:+.4f} SOL
+• Total P&amp;L: {bot_stats['total_profit_sol']:+.4f} SOL
 • Best Trade: {get_best_trade():+.2f}%
 
-*💼 Active Positions ({len(trader.positions)})*
+<b>💼 Active Positions ({len(symbols)})</b>
 {positions_text}
 
-*📊 Portfolio*
+<b>📊 Portfolio</b>
 • Invested: {total_invested:.4f} SOL
 • Current Value: {total_current_value:.4f} SOL
-• Unrealized P&L: {(total_current_value - total_invested):+.4f} SOL
+• Unrealized P&amp;L: {(total_current_value - total_invested):+.4f} SOL
 
-*⚙️ Current Settings*
+<b>⚙️ Current Settings</b>
 • Auto-Buy: {'✅ ON' if user_settings['auto_buy_enabled'] else '❌ OFF'}
 • Min Score: {user_settings['min_score']}
 • Base Amount: {user_settings['base_trade_amount_sol']} SOL
 • Stop Loss: {user_settings['initial_stop_loss']}%
 
-_Updated: {datetime.now().strftime('%H:%M:%S')}_
+<i>Updated: {datetime.now().strftime('%H:%M:%S')}</i>
     """
 
-    keyboard = [
-        [
-            InlineKeyboardButton("🔄 Refresh", callback_data="dashboard"),
-            InlineKeyboardButton("⚙️ Settings", callback_data="settings_main")
-        ],
-        [InlineKeyboardButton("⬅️ Back", callback_data="start")]
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
-
-    await update.callback_query.edit_message_text(
-        dashboard_text,
-        reply_markup=reply_markup,
-        parse_mode=ParseMode.MARKDOWN
-    )
+    _dashboard_cache.update(ts=now, key=key, text=dashboard_text)
+    await _edit_menu(update.callback_query, dashboard_text, _DASHBOARD_MARKUP)
 
 # ============================================================================
 # SETTINGS MENU - LIVE CONFIGURATION
@@ -244,68 +501,45 @@ _Updated: {datetime.now().strftime('%H:%M:%S')}_
 
 async def settings_main(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Main Settings Menu"""
-    keyboard = [
-        [
-            InlineKeyboardButton("🎯 Scanner Filters", callback_data="settings_scanner"),
-            InlineKeyboardButton("💰 Trading", callback_data="settings_trading")
-        ],
-        [
-            InlineKeyboardButton("📊 Profit Strategy", callback_data="settings_profit"),
-            InlineKeyboardButton("🔔 Alerts", callback_data="settings_alerts")
-        ],
-        [
-            InlineKeyboardButton("🚀 Quick Presets", callback_data="settings_presets"),
-            InlineKeyboardButton("🔧 Advanced", callback_data="settings_advanced")
-        ],
-        [
-            InlineKeyboardButton("💾 Save Config", callback_data="settings_save"),
-            InlineKeyboardButton("🔄 Reset", callback_data="settings_reset")
-        ],
-        [InlineKeyboardButton("⬅️ Back", callback_data="start")]
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
+    reply_markup = _SETTINGS_MAIN_MARKUP
 
     text = f"""
-*⚙️ SETTINGS MENU*
+<b>⚙️ SETTINGS MENU</b>
 ━━━━━━━━━━━━━━━━━━━━━━━
 
-*Current Configuration:*
+<b>Current Configuration:</b>
 
-*🎯 Scanner Filters*
-• Min Liquidity: ${user_settings['min_liquidity_usd']:,}
+<b>🎯 Scanner Filters</b>
+• Min Liquidity: {_settings_fmt['min_liquidity_usd']}
 • Min Score: {user_settings['min_score']}
 • Age Range: {user_settings['min_age_minutes']}-{user_settings['max_age_minutes']} min
 
-*💰 Trading*
+<b>💰 Trading</b>
 • Auto-Buy: {'✅ ON' if user_settings['auto_buy_enabled'] else '❌ OFF'}
 • Base Amount: {user_settings['base_trade_amount_sol']} SOL
 • Max Amount: {user_settings['max_trade_amount_sol']} SOL
 
-*📊 Profit Strategy*
+<b>📊 Profit Strategy</b>
 • Stop Loss: {user_settings['initial_stop_loss']}%
 • Trailing: {user_settings['trailing_percentage']}%
 • Max Hold: {user_settings['max_hold_time_minutes']} min
 
-*🔔 Alerts*
+<b>🔔 Alerts</b>
 • Enabled: {'✅' if user_settings['alerts_enabled'] else '❌'}
 • Min Score: {user_settings['min_score_alert']}
 
-_Select a category to configure_
+<i>Select a category to configure</i>
     """
 
-    await update.callback_query.edit_message_text(
-        text,
-        reply_markup=reply_markup,
-        parse_mode=ParseMode.MARKDOWN
-    )
+    await _edit_menu(update.callback_query, text, reply_markup)
 
-async def settings_scanner(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    """Scanner Filter Configuration"""
+def _build_scanner_markup() -> InlineKeyboardMarkup:
+    """Scanner Filter Keyboard (Labels zeigen aktuelle Werte)"""
     keyboard = [
         [
-            InlineKeyboardButton(f"💧 Min Liq: ${user_settings['min_liquidity_usd']:,}",
+            InlineKeyboardButton(f"💧 Min Liq: {_settings_fmt['min_liquidity_usd']}",
                                callback_data="adjust_min_liquidity"),
-            InlineKeyboardButton(f"💧 Max Liq: ${user_settings['max_liquidity_usd']:,}",
+            InlineKeyboardButton(f"💧 Max Liq: {_settings_fmt['max_liquidity_usd']}",
                                callback_data="adjust_max_liquidity")
         ],
         [
@@ -321,45 +555,45 @@ async def settings_scanner(update: Update, context: ContextTypes.DEFAULT_TYPE) -
                                callback_data="adjust_min_score")
         ],
         [
-            InlineKeyboardButton(f"📈 Min Volume: ${user_settings['min_volume_usd']:,}",
+            InlineKeyboardButton(f"📈 Min Volume: {_settings_fmt['min_volume_usd']}",
                                callback_data="adjust_min_volume"),
             InlineKeyboardButton(f"💎 Max Top10: {user_settings['max_top_10_percentage']}%",
                                callback_data="adjust_max_top10")
         ],
         [InlineKeyboardButton("⬅️ Back", callback_data="settings_main")]
     ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
+    return InlineKeyboardMarkup(keyboard)
+
+async def settings_scanner(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Scanner Filter Configuration"""
+    reply_markup = _cached_markup('scanner', _SCANNER_LABEL_KEYS, _build_scanner_markup)
 
     text = f"""
-*🎯 SCANNER FILTER SETTINGS*
+<b>🎯 SCANNER FILTER SETTINGS</b>
 ━━━━━━━━━━━━━━━━━━━━━━━
 
-*Current Filters:*
-• Min Liquidity: ${user_settings['min_liquidity_usd']:,}
-• Max Liquidity: ${user_settings['max_liquidity_usd']:,}
+<b>Current Filters:</b>
+• Min Liquidity: {_settings_fmt['min_liquidity_usd']}
+• Max Liquidity: {_settings_fmt['max_liquidity_usd']}
 • Age Range: {user_settings['min_age_minutes']}-{user_settings['max_age_minutes']} min
 • Min Holders: {user_settings['min_holder_count']}
 • Max Holders: {user_settings['max_holder_count']}
 • Max Top 10%: {user_settings['max_top_10_percentage']}%
-• Min Volume: ${user_settings['min_volume_usd']:,}
+• Min Volume: {_settings_fmt['min_volume_usd']}
 • Min Score: {user_settings['min_score']}
 
-*💡 Tips:*
+<b>💡 Tips:</b>
 • Lower liquidity = Higher risk/reward
 • Younger tokens = More volatility
 • Higher score = More selective
 
-_Click a parameter to adjust_
+<i>Click a parameter to adjust</i>
     """
 
-    await update.callback_query.edit_message_text(
-        text,
-        reply_markup=reply_markup,
-        parse_mode=ParseMode.MARKDOWN
-    )
+    await _edit_menu(update.callback_query, text, reply_markup)
 
-async def settings_trading(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    """Trading Parameters Configuration"""
+def _build_trading_markup() -> InlineKeyboardMarkup:
+    """Trading Parameter Keyboard (Labels zeigen aktuelle Werte)"""
     keyboard = [
         [
             InlineKeyboardButton(
@@ -380,9 +614,9 @@ async def settings_trading(update: Update, context: ContextTypes.DEFAULT_TYPE) -
                                callback_data="adjust_max_auto_sol")
         ],
         [
-            InlineKeyboardButton(f"📉 Min Slippage: {user_settings['min_slippage_bps']/100}%",
+            InlineKeyboardButton(f"📉 Min Slippage: {_settings_fmt['min_slippage_bps']}",
                                callback_data="adjust_min_slippage"),
-            InlineKeyboardButton(f"📈 Max Slippage: {user_settings['max_slippage_bps']/100}%",
+            InlineKeyboardButton(f"📈 Max Slippage: {_settings_fmt['max_slippage_bps']}",
                                callback_data="adjust_max_slippage")
         ],
         [
@@ -391,42 +625,42 @@ async def settings_trading(update: Update, context: ContextTypes.DEFAULT_TYPE) -
         ],
         [InlineKeyboardButton("⬅️ Back", callback_data="settings_main")]
     ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
+    return InlineKeyboardMarkup(keyboard)
+
+async def settings_trading(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Trading Parameters Configuration"""
+    reply_markup = _cached_markup('trading', _TRADING_LABEL_KEYS, _build_trading_markup)
 
     text = f"""
-*💰 TRADING SETTINGS*
+<b>💰 TRADING SETTINGS</b>
 ━━━━━━━━━━━━━━━━━━━━━━━
 
-*Position Sizing:*
+<b>Position Sizing:</b>
 • Base Amount: {user_settings['base_trade_amount_sol']} SOL
 • Max Amount: {user_settings['max_trade_amount_sol']} SOL
 • Scaling: Dynamic (based on score)
 
-*Auto-Buy Settings:*
+<b>Auto-Buy Settings:</b>
 • Enabled: {'✅ ON' if user_settings['auto_buy_enabled'] else '❌ OFF'}
 • Min Score: {user_settings['auto_buy_min_score']}
 • Max Per Trade: {user_settings['max_auto_buy_sol']} SOL
 
-*Slippage:*
-• Min: {user_settings['min_slippage_bps']/100}%
-• Max: {user_settings['max_slippage_bps']/100}%
+<b>Slippage:</b>
+• Min: {_settings_fmt['min_slippage_bps']}
+• Max: {_settings_fmt['max_slippage_bps']}
 • Mode: Dynamic (adapts to liquidity)
 
-*Advanced:*
+<b>Advanced:</b>
 • MEV Protection: {'✅ ON' if user_settings['use_mev_protection'] else '❌ OFF'}
 • Priority Fee: {user_settings['priority_fee_lamports']} lamports
 
-_Click a parameter to adjust_
+<i>Click a parameter to adjust</i>
     """
 
-    await update.callback_query.edit_message_text(
-        text,
-        reply_markup=reply_markup,
-        parse_mode=ParseMode.MARKDOWN
-    )
+    await _edit_menu(update.callback_query, text, reply_markup)
 
-async def settings_profit(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    """Profit Strategy Configuration"""
+def _build_profit_markup() -> InlineKeyboardMarkup:
+    """Profit Strategy Keyboard (Labels zeigen aktuelle Werte)"""
     keyboard = [
         [
             InlineKeyboardButton(f"🛑 Stop Loss: {user_settings['initial_stop_loss']}%",
@@ -445,111 +679,47 @@ async def settings_profit(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         ],
         [InlineKeyboardButton("⬅️ Back", callback_data="settings_main")]
     ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
+    return InlineKeyboardMarkup(keyboard)
+
+async def settings_profit(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Profit Strategy Configuration"""
+    reply_markup = _cached_markup('profit', _PROFIT_LABEL_KEYS, _build_profit_markup)
 
     # Get TP levels from profit_strategy
-    tp_text = "\n".join([
-        f"  • {(mult-1)*100:.0f}% profit → Sell {pct*100:.0f}%"
-        for mult, pct in profit_strategy.TAKE_PROFIT_LEVELS
-    ])
+    tp_text = _get_tp_text()
 
     text = f"""
-*📊 PROFIT STRATEGY SETTINGS*
+<b>📊 PROFIT STRATEGY SETTINGS</b>
 ━━━━━━━━━━━━━━━━━━━━━━━
 
-*Stop Loss:*
+<b>Stop Loss:</b>
 • Initial: {user_settings['initial_stop_loss']}%
 • Type: Trailing (adaptive)
 • Activation: {user_settings['trailing_activation']}x
 • Trailing: {user_settings['trailing_percentage']}% from peak
 
-*Take Profit Levels:*
+<b>Take Profit Levels:</b>
 {tp_text}
 
-*Exit Conditions:*
+<b>Exit Conditions:</b>
 • Max Hold Time: {user_settings['max_hold_time_minutes']} minutes
 • Volume Drop: Auto-detect
 • Momentum Loss: Auto-detect
 
-*💡 Strategy:*
+<b>💡 Strategy:</b>
 This uses a smart multi-level exit strategy that secures profits while letting winners run.
 
-_Click a parameter to adjust_
+<i>Click a parameter to adjust</i>
     """
 
-    await update.callback_query.edit_message_text(
-        text,
-        reply_markup=reply_markup,
-        parse_mode=ParseMode.MARKDOWN
-    )
+    await _edit_menu(update.callback_query, text, reply_markup)
 
 async def settings_presets(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Quick Strategy Presets"""
-    keyboard = [
-        [
-            InlineKeyboardButton("🔥 AGGRESSIVE", callback_data="preset_aggressive"),
-            InlineKeyboardButton("⚖️ BALANCED", callback_data="preset_balanced")
-        ],
-        [
-            InlineKeyboardButton("🛡 CONSERVATIVE", callback_data="preset_conservative"),
-            InlineKeyboardButton("⚡ SCALPING", callback_data="preset_scalping")
-        ],
-        [
-            InlineKeyboardButton("🎯 SNIPING", callback_data="preset_sniping"),
-            InlineKeyboardButton("💎 HODL", callback_data="preset_hodl")
-        ],
-        [InlineKeyboardButton("⬅️ Back", callback_data="settings_main")]
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
-
-    text = """
-*🚀 QUICK PRESETS*
-━━━━━━━━━━━━━━━━━━━━━━━
+    reply_markup = _PRESETS_MARKUP
+    text = _PRESETS_HELP_TEXT
 
-*🔥 AGGRESSIVE*
-High risk, high reward. Early entries, larger positions.
-• Risk: ⭐⭐⭐⭐⭐
-• Reward: 5-10x potential
-• Win Rate: ~30-40%
-
-*⚖️ BALANCED*
-Good risk/reward ratio. Proven approach.
-• Risk: ⭐⭐⭐
-• Reward: 2-3x potential
-• Win Rate: ~50-60%
-
-*🛡 CONSERVATIVE*
-Low risk, steady gains. Focus on quality.
-• Risk: ⭐⭐
-• Reward: 1.5-2x potential
-• Win Rate: ~60-70%
-
-*⚡ SCALPING*
-Quick in/out. Many small profits.
-• Risk: ⭐⭐
-• Reward: 1.2-1.5x potential
-• Win Rate: ~70%+
-
-*🎯 SNIPING*
-Ultra-early entries. Highest risk/reward.
-• Risk: ⭐⭐⭐⭐⭐
-• Reward: 10-50x potential
-• Win Rate: ~20-30%
-
-*💎 HODL*
-Long-term holds. Let winners run.
-• Risk: ⭐⭐⭐
-• Reward: 3-5x potential
-• Win Rate: ~40-50%
-
-_Select a preset to apply_
-    """
-
-    await update.callback_query.edit_message_text(
-        text,
-        reply_markup=reply_markup,
-        parse_mode=ParseMode.MARKDOWN
-    )
+    await _edit_menu(update.callback_query, text, reply_markup)
 
 # ============================================================================
 # PARAMETER ADJUSTMENT HANDLERS
@@ -570,195 +740,250 @@ async def handle_parameter_adjustment(update: Update, context: ContextTypes.DEFA
     keyboard.append([InlineKeyboardButton("⬅️ Back", callback_data="settings_scanner")])
     reply_markup = InlineKeyboardMarkup(keyboard)
 
-    await update.callback_query.edit_message_text(
-        f"*Select {parameter.replace('_', ' ').title()}:*\n\nCurrent: {user_settings.get(parameter, 'N/A')}",
-        reply_markup=reply_markup,
-        parse_mode=ParseMode.MARKDOWN
+    await _edit_menu(
+        update.callback_query,
+        f"<b>Select {parameter.replace('_', ' ').title()}:</b>\n\nCurrent: {user_settings.get(parameter, 'N/A')}",
+        reply_markup
     )
 
+# Strategy Presets (einmal angelegt, read-only)
+_PRESETS: Mapping[str, Mapping[str, Any]] = MappingProxyType({
+    'aggressive': MappingProxyType({
+        'min_liquidity_usd': 2000,
+        'max_liquidity_usd': 50000,
+        'min_age_minutes': 0.1,
+        'max_age_minutes': 2,
+        'min_holder_count': 20,
+        'min_score': 65,
+        'base_trade_amount_sol': 0.02,
+        'max_trade_amount_sol': 0.3,
+        'initial_stop_loss': 25,
+        'trailing_percentage': 30,
+        'max_hold_time_minutes': 15
+    }),
+    'balanced': MappingProxyType({
+        'min_liquidity_usd': 10000,
+        'max_liquidity_usd': 200000,
+        'min_age_minutes': 1,
+        'max_age_minutes': 5,
+        'min_holder_count': 100,
+        'min_score': 70,
+        'base_trade_amount_sol': 0.05,
+        'max_trade_amount_sol': 0.3,
+        'initial_stop_loss': 15,
+        'trailing_percentage': 20,
+        'max_hold_time_minutes': 30
+    }),
+    'conservative': MappingProxyType({
+        'min_liquidity_usd': 20000,
+        'max_liquidity_usd': 500000,
+        'min_age_minutes': 2,
+        'max_age_minutes': 10,
+        'min_holder_count': 200,
+        'min_score': 80,
+        'base_trade_amount_sol': 0.1,
+        'max_trade_amount_sol': 0.5,
+        'initial_stop_loss': 10,
+        'trailing_percentage': 15,
+        'max_hold_time_minutes': 60
+    }),
+    'scalping': MappingProxyType({
+        'min_liquidity_usd': 15000,
+        'max_liquidity_usd': 300000,
+        'min_age_minutes': 1,
+        'max_age_minutes': 5,
+        'min_holder_count': 150,
+        'min_score': 75,
+        'base_trade_amount_sol': 0.03,
+        'max_trade_amount_sol': 0.2,
+        'initial_stop_loss': 8,
+        'trailing_percentage': 10,
+        'max_hold_time_minutes': 10
+    }),
+    'sniping': MappingProxyType({
+        'min_liquidity_usd': 1000,
+        'max_liquidity_usd': 20000,
+        'min_age_minutes': 0.05,
+        'max_age_minutes': 1,
+        'min_holder_count': 10,
+        'min_score': 60,
+        'base_trade_amount_sol': 0.01,
+        'max_trade_amount_sol': 0.1,
+        'initial_stop_loss': 30,
+        'trailing_percentage': 40,
+        'max_hold_time_minutes': 5
+    }),
+    'hodl': MappingProxyType({
+        'min_liquidity_usd': 50000,
+        'max_liquidity_usd': 1000000,
+        'min_age_minutes': 5,
+        'max_age_minutes': 30,
+        'min_holder_count': 500,
+        'min_score': 85,
+        'base_trade_amount_sol': 0.2,
+        'max_trade_amount_sol': 1.0,
+        'initial_stop_loss': 20,
+        'trailing_percentage': 25,
+        'max_hold_time_minutes': 240
+    })
+})
+
 async def apply_preset(preset_name: str):
     """Apply a strategy preset"""
-    presets = {
-        'aggressive': {
-            'min_liquidity_usd': 2000,
-            'max_liquidity_usd': 50000,
-            'min_age_minutes': 0.1,
-            'max_age_minutes': 2,
-            'min_holder_count': 20,
-            'min_score': 65,
-            'base_trade_amount_sol': 0.02,
-            'max_trade_amount_sol': 0.3,
-            'initial_stop_loss': 25,
-            'trailing_percentage': 30,
-            'max_hold_time_minutes': 15
-        },
-        'balanced': {
-            'min_liquidity_usd': 10000,
-            'max_liquidity_usd': 200000,
-            'min_age_minutes': 1,
-            'max_age_minutes': 5,
-            'min_holder_count': 100,
-            'min_score': 70,
-            'base_trade_amount_sol': 0.05,
-            'max_trade_amount_sol': 0.3,
-            'initial_stop_loss': 15,
-            'trailing_percentage': 20,
-            'max_hold_time_minutes': 30
-        },
-        'conservative': {
-            'min_liquidity_usd': 20000,
-            'max_liquidity_usd': 500000,
-            'min_age_minutes': 2,
-            'max_age_minutes': 10,
-            'min_holder_count': 200,
-            'min_score': 80,
-            'base_trade_amount_sol': 0.1,
-            'max_trade_amount_sol': 0.5,
-            'initial_stop_loss': 10,
-            'trailing_percentage': 15,
-            'max_hold_time_minutes': 60
-        },
-        'scalping': {
-            'min_liquidity_usd': 15000,
-            'max_liquidity_usd': 300000,
-            'min_age_minutes': 1,
-            'max_age_minutes': 5,
-            'min_holder_count': 150,
-            'min_score': 75,
-            'base_trade_amount_sol': 0.03,
-            'max_trade_amount_sol': 0.2,
-            'initial_stop_loss': 8,
-            'trailing_percentage': 10,
-            'max_hold_time_minutes': 10
-        },
-        'sniping': {
-            'min_liquidity_usd': 1000,
-            'max_liquidity_usd': 20000,
-            'min_age_minutes': 0.05,
-            'max_age_minutes': 1,
-            'min_holder_count': 10,
-            'min_score': 60,
-            'base_trade_amount_sol': 0.01,
-            'max_trade_amount_sol': 0.1,
-            'initial_stop_loss': 30,
-            'trailing_percentage': 40,
-            'max_hold_time_minutes': 5
-        },
-        'hodl': {
-            'min_liquidity_usd': 50000,
-            'max_liquidity_usd': 1000000,
-            'min_age_minutes': 5,
-            'max_age_minutes': 30,
-            'min_holder_count': 500,
-            'min_score': 85,
-            'base_trade_amount_sol': 0.2,
-            'max_trade_amount_sol': 1.0,
-            'initial_stop_loss': 20,
-            'trailing_percentage': 25,
-            'max_hold_time_minutes': 240
-        }
-    }
-
-    if preset_name in presets:
-        user_settings.update(presets[preset_name])
-        # Update global config
-        update_global_config()
-        return True
-    return False
+    preset = _PRESETS.get(preset_name)
+    if preset is None:
+        return False
+
+    user_settings.update(preset)
+    # Update global config
+    update_global_config()
+    return True
+
+# user_settings Key -> Config Attribut, pro Config Sektion
+_CONFIG_BINDINGS = (
+    ('scanner_filters', (
+        ('MIN_LIQUIDITY_USD', 'min_liquidity_usd'),
+        ('MAX_LIQUIDITY_USD', 'max_liquidity_usd'),
+        ('MIN_AGE_MINUTES', 'min_age_minutes'),
+        ('MAX_AGE_MINUTES', 'max_age_minutes'),
+        ('MIN_HOLDER_COUNT', 'min_holder_count'),
+        ('MIN_SCORE', 'min_score'),
+        ('MIN_VOLUME_USD', 'min_volume_usd'),
+        ('MAX_TOP_10_PERCENTAGE', 'max_top_10_percentage'),
+    )),
+    ('trading_config', (
+        ('BASE_TRADE_AMOUNT_SOL', 'base_trade_amount_sol'),
+        ('MAX_TRADE_AMOUNT_SOL', 'max_trade_amount_sol'),
+        ('MIN_SLIPPAGE_BPS', 'min_slippage_bps'),
+        ('MAX_SLIPPAGE_BPS', 'max_slippage_bps'),
+        ('USE_MEV_PROTECTION', 'use_mev_protection'),
+        ('PRIORITY_FEE_LAMPORTS', 'priority_fee_lamports'),
+    )),
+    ('profit_strategy', (
+        ('INITIAL_STOP_LOSS', 'initial_stop_loss'),
+        ('TRAILING_ACTIVATION', 'trailing_activation'),
+        ('TRAILING_PERCENTAGE', 'trailing_percentage'),
+        ('MAX_HOLD_TIME_MINUTES', 'max_hold_time_minutes'),
+    )),
+)
 
 def update_global_config():
     """Update global config from user_settings"""
-    # Update scanner_filters
-    cfg.scanner_filters.MIN_LIQUIDITY_USD = user_settings['min_liquidity_usd']
-    cfg.scanner_filters.MAX_LIQUIDITY_USD = user_settings['max_liquidity_usd']
-    cfg.scanner_filters.MIN_AGE_MINUTES = user_settings['min_age_minutes']
-    cfg.scanner_filters.MAX_AGE_MINUTES = user_settings['max_age_minutes']
-    cfg.scanner_filters.MIN_HOLDER_COUNT = user_settings['min_holder_count']
-    cfg.scanner_filters.MIN_SCORE = user_settings['min_score']
-    cfg.scanner_filters.MIN_VOLUME_USD = user_settings['min_volume_usd']
-    cfg.scanner_filters.MAX_TOP_10_PERCENTAGE = user_settings['max_top_10_percentage']
-
-    # Update trading_config
-    cfg.trading_config.BASE_TRADE_AMOUNT_SOL = user_settings['base_trade_amount_sol']
-    cfg.trading_config.MAX_TRADE_AMOUNT_SOL = user_settings['max_trade_amount_sol']
-    cfg.trading_config.MIN_SLIPPAGE_BPS = user_settings['min_slippage_bps']
-    cfg.trading_config.MAX_SLIPPAGE_BPS = user_settings['max_slippage_bps']
-    cfg.trading_config.USE_MEV_PROTECTION = user_settings['use_mev_protection']
-    cfg.trading_config.PRIORITY_FEE_LAMPORTS = user_settings['priority_fee_lamports']
-
-    # Update profit_strategy
-    cfg.profit_strategy.INITIAL_STOP_LOSS = user_settings['initial_stop_loss']
-    cfg.profit_strategy.TRAILING_ACTIVATION = user_settings['trailing_activation']
-    cfg.profit_strategy.TRAILING_PERCENTAGE = user_settings['trailing_percentage']
-    cfg.profit_strategy.MAX_HOLD_TIME_MINUTES = user_settings['max_hold_time_minutes']
+    # Alte Keyboard-Varianten verwerfen (Labels haben sich geändert)
+    _MENU_CACHE.clear()
+    _refresh_settings_fmt()
+    # Dashboard zeigt Settings an - gecachten Text nicht weiter ausliefern
+    _dashboard_cache['key'] = None
+
+    # Ein dict.update pro Config Sektion (Dataclasses ohne __slots__)
+    for section, fields in _CONFIG_BINDINGS:
+        vars(getattr(cfg, section)).update(
+            {attr: user_settings[key] for attr, key in fields}
+        )
 
 # ============================================================================
 # CALLBACK HANDLER - ROUTER
 # ============================================================================
 
-async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    """Enhanced callback handler with all actions"""
+async def _handle_preset(update: Update, context: ContextTypes.DEFAULT_TYPE, preset_name: str) -> None:
+    """Preset anwenden (callback_data: preset_<name>)"""
     query = update.callback_query
-    await query.answer()
+    if await apply_preset(preset_name):
+        await query.answer(f"✅ {preset_name.upper()} preset applied!", show_alert=True)
+        await settings_main(update, context)
+    else:
+        await query.answer("❌ Preset not found!", show_alert=True)
+
+async def _toggle_auto_buy(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Auto-Buy an/aus"""
+    user_settings['auto_buy_enabled'] = not user_settings['auto_buy_enabled']
+    update_global_config()
+    await settings_trading(update, context)
+
+async def _toggle_mev_protection(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """MEV Protection an/aus"""
+    user_settings['use_mev_protection'] = not user_settings['use_mev_protection']
+    update_global_config()
+    await settings_trading(update, context)
+
+async def _emergency_stop(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Sicherheitsabfrage vor dem Emergency Stop"""
+    keyboard = [
+        [
+            InlineKeyboardButton("⚠️ YES, STOP EVERYTHING", callback_data="confirm_emergency_stop"),
+            InlineKeyboardButton("❌ Cancel", callback_data="start")
+        ]
+    ]
+    await _edit_menu(
+        update.callback_query,
+        "<b>🚨 EMERGENCY STOP</b>\n\nThis will:\n• Stop the scanner\n• Cancel pending orders\n• Keep positions open\n\nAre you sure?",
+        InlineKeyboardMarkup(keyboard)
+    )
 
-    data = query.data
+async def _confirm_emergency_stop(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Scanner stoppen"""
+    if scanner.running:
+        await scanner.stop()
+    await update.callback_query.answer("🛑 Bot stopped!", show_alert=True)
+    await start(update, context)
 
+# Exakte callback_data -> Handler (O(1) Lookup statt if/elif Kette)
+CALLBACK_ROUTES = {
     # Navigation
-    if data == "start":
-        await start(update, context)
-    elif data == "dashboard":
-        await dashboard(update, context)
-    elif data == "settings_main":
-        await settings_main(update, context)
-    elif data == "settings_scanner":
-        await settings_scanner(update, context)
-    elif data == "settings_trading":
-        await settings_trading(update, context)
-    elif data == "settings_profit":
-        await settings_profit(update, context)
-    elif data == "settings_presets":
-        await settings_presets(update, context)
-
-    # Presets
-    elif data.startswith("preset_"):
-        preset_name = data.replace("preset_", "")
-        if await apply_preset(preset_name):
-            await query.answer(f"✅ {preset_name.upper()} preset applied!", show_alert=True)
-            await settings_main(update, context)
-        else:
-            await query.answer("❌ Preset not found!", show_alert=True)
+    'start': start,
+    'dashboard': dashboard,
+    'settings_main': settings_main,
+    'settings_scanner': settings_scanner,
+    'settings_trading': settings_trading,
+    'settings_profit': settings_profit,
+    'settings_presets': settings_presets,
 
     # Toggles
-    elif data == "toggle_auto_buy":
-        user_settings['auto_buy_enabled'] = not user_settings['auto_buy_enabled']
-        update_global_config()
-        await settings_trading(update, context)
-
-    elif data == "toggle_mev_protection":
-        user_settings['use_mev_protection'] = not user_settings['use_mev_protection']
-        update_global_config()
-        await settings_trading(update, context)
+    'toggle_auto_buy': _toggle_auto_buy,
+    'toggle_mev_protection': _toggle_mev_protection,
 
     # Emergency Stop
-    elif data == "emergency_stop":
-        keyboard = [
-            [
-                InlineKeyboardButton("⚠️ YES, STOP EVERYTHING", callback_data="confirm_emergency_stop"),
-                InlineKeyboardButton("❌ Cancel", callback_data="start")
-            ]
-        ]
-        await query.edit_message_text(
-            "*🚨 EMERGENCY STOP*\n\nThis will:\n• Stop the scanner\n• Cancel pending orders\n• Keep positions open\n\nAre you sure?",
-            reply_markup=InlineKeyboardMarkup(keyboard),
-            parse_mode=ParseMode.MARKDOWN
-        )
+    'emergency_stop': _emergency_stop,
+    'confirm_emergency_stop': _confirm_emergency_stop,
+}
+
+# Prefix-Routen, Handler bekommt den Rest der callback_data
+PREFIX_ROUTES = (
+    ('preset_', _handle_preset),
+)
+
+# Handler die die Query selbst mit einem Alert beantworten
+_SELF_ANSWERING = {_handle_preset, _confirm_emergency_stop}
+
+async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Enhanced callback handler with all actions"""
+    query = update.callback_query
+    data = query.data
+
+    handler = CALLBACK_ROUTES.get(data)
+    args = ()
+    if handler is None:
+        for prefix, prefix_handler in PREFIX_ROUTES:
+            if data.startswith(prefix):
+                handler = prefix_handler
+                args = (data[len(prefix):],)
+                break
+
+    if handler is None:
+        await query.answer()
+        return
+
+    if handler in _SELF_ANSWERING:
+        await handler(update, context, *args)
+        return
 
-    elif data == "confirm_emergency_stop":
-        from scanner import scanner
-        if scanner.running:
-            await scanner.stop()
-        await query.answer("🛑 Bot stopped!", show_alert=True)
-        await start(update, context)
+    # answer() läuft parallel zum Edit - spart einen Roundtrip pro Tap,
+    # eager gestartet geht der Request noch vor dem Edit raus
+    answer = _create_eager_task(query.answer())
+    try:
+        await handler(update, context, *args)
+    finally:
+        await answer
 
 # ============================================================================
 # HELPER FUNCTIONS
@@ -779,27 +1004,71 @@ def get_win_rate() -> float:
 
 def get_avg_profit() -> float:
     """Calculate average profit"""
-    if not trade_history:
+    if bot_stats['total_trades'] == 0:
         return 0.0
-    profits = [t.get('profit_pct', 0) for t in trade_history]
-    return sum(profits) / len(profits) if profits else 0.0
+    return bot_stats['sum_profit_pct'] / bot_stats['total_trades']
 
 def get_best_trade() -> float:
     """Get best trade profit"""
-    if not trade_history:
+    if bot_stats['total_trades'] == 0:
         return 0.0
-    return max([t.get('profit_pct', 0) for t in trade_history], default=0.0)
+    return bot_stats['best_profit_pct']
+
+def record_trade(trade: Dict) -> None:
+    """Record closed trade and update running aggregates"""
+    trade_history.append(trade)
+
+    profit_pct = trade.get('profit_pct', 0)
+    bot_stats['total_trades'] += 1
+    bot_stats['winning_trades'] += profit_pct > 0
+    bot_stats['total_profit_sol'] += trade.get('profit_sol', 0)
+    bot_stats['sum_profit_pct'] += profit_pct
+    bot_stats['best_profit_pct'] = max(bot_stats['best_profit_pct'], profit_pct)
+
+def _on_trade_closed(trade: Dict) -> None:
+    """Trader Listener - übersetzt den Trade Record für record_trade"""
+    record_trade({
+        'symbol': trade['symbol'],
+        'profit_pct': trade['pnl_pct'],
+        'profit_sol': trade['pnl'],
+        'reason': trade['reason'],
+        'exit_time': trade['exit_time']
+    })
 
 def setup_bot():
     """Setup enhanced bot"""
-    global telegram_app, bot_instance
+    global telegram_app, bot_instance, _chat_id
 
+    # Env einmalig lesen - send_message greift nur noch auf _chat_id zu
     token = os.getenv("TELEGRAM_BOT_TOKEN")
     if not token:
         raise ValueError("TELEGRAM_BOT_TOKEN not found!")
+    chat_id = os.getenv("TELEGRAM_CHAT_ID")
+    if not chat_id:
+        raise ValueError("TELEGRAM_CHAT_ID not found!")
+
+    telegram_app = (
+        Application.builder()
+        .token(token)
+        .connection_pool_size(CONNECTION_POOL_SIZE)
+        .pool_timeout(POOL_TIMEOUT)
+        .connect_timeout(CONNECT_TIMEOUT)
+        .build()
+    )
+    # Eigene Bot Instanz für ausgehende Nachrichten - Connection Pool bleibt warm
+    # und funktioniert auch nach dem Shutdown der Application (Stop-Nachricht)
+    bot_instance = Bot(
+        token=token,
+        request=HTTPXRequest(
+            connection_pool_size=CONNECTION_POOL_SIZE,
+            pool_timeout=POOL_TIMEOUT,
+            connect_timeout=CONNECT_TIMEOUT
+        )
+    )
+    _chat_id = chat_id
 
-    telegram_app = Application.builder().token(token).build()
-    bot_instance = Bot(token=token)
+    # Geschlossene Trades direkt in die laufenden Aggregate übernehmen
+    trader.trader.trade_listeners.append(_on_trade_closed)
 
     # Commands
     telegram_app.add_handler(CommandHandler("start", start))
@@ -811,22 +1080,114 @@ def setup_bot():
     return telegram_app
 
 async def send_message(text: str, important: bool = False):
-    """Send message to user"""
-    if not telegram_app:
+    """Send message to user (nur einreihen, Versand übernimmt der Alert Worker)"""
+    if not telegram_app or not _chat_id:
         return
 
-    chat_id = os.getenv("TELEGRAM_CHAT_ID")
-    if not chat_id:
+    # De-dupe vor dem Rate Limit - wichtige Nachrichten immer durchlassen
+    if not important and _is_duplicate_alert(text):
+        bot_stats['duplicate_alerts'] += 1
         return
 
-    bot = Bot(token=os.getenv("TELEGRAM_BOT_TOKEN"))
+    global _alert_worker
+    if _alert_worker is None or _alert_worker.done():
+        _alert_worker = asyncio.create_task(_alert_sender(), name="telegram_alerts")
 
     try:
-        await bot.send_message(
-            chat_id=chat_id,
-            text=text,
-            parse_mode=ParseMode.MARKDOWN,
-            disable_web_page_preview=True
-        )
-    except Exception as e:
-        print(f"Telegram send error: {e}")
+        alert_queue.put_nowait(text)
+    except asyncio.QueueFull:
+        if not important:
+            # Unwichtige Alerts bei Überlauf verwerfen (nicht merken - Retry bleibt möglich)
+            bot_stats['dropped_alerts'] += 1
+            return
+        await alert_queue.put(text)
+        return
+
+    if not important:
+        _remember_alert(text)
+
+async def flush_messages(timeout: float = 5.0):
+    """Wartet bis alle eingereihten Nachrichten versendet sind (z.B. beim Shutdown)"""
+    if _alert_worker is None or _alert_worker.done():
+        return
+    try:
+        await asyncio.wait_for(alert_queue.join(), timeout)
+    except asyncio.TimeoutError:
+        print(f"Telegram: {alert_queue.qsize()} Nachrichten nicht mehr versendet")
+
+async def _alert_sender():
+    """Hintergrund Worker - bündelt Alerts und versendet sie rate-limitiert"""
+    while True:
+        batch = [await alert_queue.get()]
+        while len(batch) < ALERT_BATCH_SIZE:
+            try:
+                batch.append(alert_queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+
+        try:
+            for group in _coalesce(batch):
+                await _deliver_group(group)
+        except Exception as e:
+            print(f"Telegram alert worker error: {e}")
+        finally:
+            for _ in batch:
+                alert_queue.task_done()
+
+def _coalesce(batch: List[str]) -> List[List[str]]:
+    """Teilt Alerts in Gruppen, die je eine Nachricht (<= Telegram Limit) ergeben"""
+    groups = []
+    current = []
+    length = 0
+    for text in batch:
+        if current and length + len(ALERT_SEPARATOR) + len(text) > MAX_MESSAGE_LENGTH:
+            groups.append(current)
+            current = [text]
+            length = len(text)
+        else:
+            length += len(ALERT_SEPARATOR) + len(text) if current else len(text)
+            current.append(text)
+    if current:
+        groups.append(current)
+    return groups
+
+async def _deliver_group(group: List[str]):
+    """Gruppe als eine Nachricht senden - bei BadRequest (z.B. Markdown über
+    Alert-Grenzen hinweg) jeden Alert einzeln, damit nur der fehlerhafte verloren geht"""
+    try:
+        await _deliver(ALERT_SEPARATOR.join(group))
+        return
+    except BadRequest as e:
+        if len(group) == 1:
+            print(f"Telegram send error: {e}")
+            return
+
+    for text in group:
+        try:
+            await _deliver(text)
+        except BadRequest as e:
+            print(f"Telegram send error: {e}")
+
+async def _deliver(text: str):
+    """Eine Nachricht senden - Rate Limit + Retry mit Backoff bei FloodWait.
+    BadRequest wird an den Aufrufer weitergegeben"""
+    backoff = 1.0
+    for _ in range(SEND_MAX_RETRIES):
+        await _SEND_BUCKET.acquire()
+        try:
+            await bot_instance.send_message(
+                chat_id=_chat_id,
+                text=text,
+                parse_mode=ParseMode.MARKDOWN,
+                disable_web_page_preview=True
+            )
+            return
+        except RetryAfter as e:
+            # FloodWait - mindestens die von Telegram vorgegebene Pause einhalten
+            await asyncio.sleep(max(e.retry_after, backoff))
+            backoff *= 2
+        except BadRequest:
+            raise
+        except Exception as e:
+            print(f"Telegram send error: {e}")
+            return
@@ -5,16 +5,29 @@ Smart Order Routing, Multi-DEX Aggregation und kritische Optimierungen
 import asyncio
 import aiohttp
 import time
+import random
 import numpy as np
 import os
 import base58
 import base64
-from typing import Dict, List, Tuple, Optional, Any
+from typing import Dict, List, Tuple, Optional, Any, Callable
 from dataclasses import dataclass
 from decimal import Decimal
 import heapq
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 import statistics
+try:
+    # httpx (mit HTTP/2 wenn h2 installiert) für den Jupiter Hot Path
+    import httpx
+    HTTPX_AVAILABLE = True
+    try:
+        import h2  # noqa: F401
+        HTTP2_AVAILABLE = True
+    except ImportError:
+        HTTP2_AVAILABLE = False
+except ImportError:
+    HTTPX_AVAILABLE = False
+    HTTP2_AVAILABLE = False
 from solders.keypair import Keypair
 from solders.transaction import VersionedTransaction
 from solana.rpc.async_api import AsyncClient
@@ -87,6 +100,20 @@ class DEXQuote:
             return 0
         return (self.output_amount / self.input_amount) * (1 - self.fee)
 
+# Quote Cache: LRU mit adaptiver TTL (monotonic)
+QUOTE_CACHE_SIZE = 4096
+QUOTE_CACHE_TTL = 5.0  # Basis-TTL bei 0.1% Price Impact (Sekunden)
+QUOTE_CACHE_MIN_TTL = 0.5  # Dünne Pools / hoher Impact
+QUOTE_CACHE_MAX_TTL = 15.0  # Tiefe Pools / kaum Impact
+QUOTE_CACHE_JITTER = 0.1  # ±10% gegen synchronisierte Re-Fetches
+QUOTE_EARLY_REFRESH = 0.2  # Hintergrund-Refresh im letzten 20% der TTL
+
+def _quote_ttl(quote: Dict) -> float:
+    """TTL nach Price Impact - hoher Impact (volatil/dünn) = kurze Lebensdauer"""
+    impact = abs(float(quote.get('priceImpactPct', quote.get('price_impact', 0)) or 0))
+    ttl = QUOTE_CACHE_TTL * (0.1 / max(impact, 0.01))
+    return min(max(ttl, QUOTE_CACHE_MIN_TTL), QUOTE_CACHE_MAX_TTL)
+
 class SmartOrderRouter:
     """
     Intelligenter Order Router für beste Ausführung über mehrere DEXs
@@ -99,7 +126,11 @@ class SmartOrderRouter:
             'orca': OrcaDEX(),
             'serum': SerumDEX()
         }
-        self.quote_cache = {}
+        # (input_mint, output_mint, amount) -> (expires_at, ttl, quote), LRU-Reihenfolge
+        self.quote_cache: "OrderedDict[Tuple[str, str, int], Tuple[float, float, Dict]]" = OrderedDict()
+        # Singleflight: laufende Fetches pro Key, gleichzeitige Misses teilen sich einen
+        self._inflight: Dict[Tuple[str, str, int], asyncio.Future] = {}
+        self._refresh_tasks = set()  # Referenzen auf Hintergrund-Refreshes
         self.execution_stats = defaultdict(lambda: {
             'success': 0,
             'failed': 0,
@@ -115,12 +146,70 @@ class SmartOrderRouter:
         Holt beste Quote von allen DEXs
         """
         # Check cache
-        cache_key = f"{input_mint}_{output_mint}_{amount}"
-        if cache_key in self.quote_cache:
-            cached = self.quote_cache[cache_key]
-            if time.time() - cached['timestamp'] < 5:  # 5 seconds cache
-                return cached['quote']
+        cache_key = (input_mint, output_mint, amount)
+        cached = self.quote_cache.get(cache_key)
+        if cached is not None:
+            expires_at, ttl, quote = cached
+            remaining = expires_at - time.monotonic()
+            if remaining > 0:
+                self.quote_cache.move_to_end(cache_key)
+                # Kurz vor Ablauf: im Hintergrund erneuern, gecachte Quote sofort liefern
+                if remaining < QUOTE_EARLY_REFRESH * ttl and cache_key not in self._inflight:
+                    task = asyncio.create_task(self._refresh_quote(cache_key, slippage_bps))
+                    self._refresh_tasks.add(task)
+                    task.add_done_callback(self._refresh_tasks.discard)
+                return quote
+            del self.quote_cache[cache_key]
+            
+        return await self._load_quote(cache_key, slippage_bps)
+        
+    async def _refresh_quote(self, cache_key: Tuple[str, str, int], slippage_bps: int):
+        """Early Refresh im Hintergrund (Fehler nur loggen)"""
+        try:
+            await self._load_quote(cache_key, slippage_bps)
+        except Exception as e:
+            print(f"Quote refresh error: {e}")
+            
+    async def _load_quote(self, cache_key: Tuple[str, str, int], slippage_bps: int) -> Optional[Dict]:
+        """Quote holen (Singleflight pro Key) und mit adaptiver TTL cachen"""
+        input_mint, output_mint, amount = cache_key
+        
+        # Gleiche Anfrage läuft bereits -> auf deren Ergebnis warten
+        inflight = self._inflight.get(cache_key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+            
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[cache_key] = future
+        try:
+            best_quote = await self._fetch_best_quote(input_mint, output_mint, amount, slippage_bps)
+        except asyncio.CancelledError:
+            # Wartende bekommen "keine Quote" statt einer fremden Cancellation
+            future.set_result(None)
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # als abgerufen markieren (keine Warnung ohne Wartende)
+            raise
+        else:
+            future.set_result(best_quote)
+        finally:
+            self._inflight.pop(cache_key, None)
+            
+        # Cache result (TTL mit Jitter, damit Keys nicht gleichzeitig ablaufen)
+        if best_quote is not None:
+            ttl = _quote_ttl(best_quote)
+            expires_at = time.monotonic() + ttl * random.uniform(1 - QUOTE_CACHE_JITTER, 1 + QUOTE_CACHE_JITTER)
+            self.quote_cache[cache_key] = (expires_at, ttl, best_quote)
+            self.quote_cache.move_to_end(cache_key)
+            if len(self.quote_cache) > QUOTE_CACHE_SIZE:
+                self.quote_cache.popitem(last=False)
                 
+        return best_quote
+        
+    async def _fetch_best_quote(self, input_mint: str, output_mint: str,
+                                amount: int, slippage_bps: int) -> Optional[Dict]:
+        """Quotes von allen DEXs holen, analysieren und Split-Routing prüfen"""
         # Get quotes from all DEXs in parallel
         quote_tasks = []
         for name, dex in self.dexs.items():
@@ -152,12 +241,6 @@ class SmartOrderRouter:
         if split_quote and self._is_split_beneficial(best_quote, split_quote):
             best_quote = split_quote
             
-        # Cache result
-        self.quote_cache[cache_key] = {
-            'quote': best_quote,
-            'timestamp': time.time()
-        }
-        
         return best_quote
         
     async def _get_quote_safe(self, dex, input_mint: str, 
@@ -179,24 +262,28 @@ class SmartOrderRouter:
         if not quotes:
             return None
             
-        # Score each quote
-        scored_quotes = []
+        # Ein Durchlauf: Score jeder Quote einmal, beste Quote (erste bei
+        # Gleichstand) und schlechtesten Output mitführen statt sort + min
+        compare = len(quotes) > 1
+        best_score = float('-inf')
+        best_quote = None
+        worst_output = None
         for quote in quotes:
             score = self._calculate_quote_score(quote)
-            scored_quotes.append((score, quote))
-            
-        # Sort by score (higher is better)
-        scored_quotes.sort(reverse=True, key=lambda x: x[0])
-        
-        best_quote = scored_quotes[0][1]
+            if score > best_score:
+                best_score = score
+                best_quote = quote
+            if compare:
+                output = quote['outputAmount']
+                if worst_output is None or output < worst_output:
+                    worst_output = output
         
         # Add analysis data
         best_quote['alternatives'] = len(quotes) - 1
-        best_quote['score'] = scored_quotes[0][0]
+        best_quote['score'] = best_score
         
         # Calculate savings vs worst quote
-        if len(scored_quotes) > 1:
-            worst_output = min(q[1]['outputAmount'] for q in scored_quotes)
+        if compare:
             best_output = best_quote['outputAmount']
             savings_pct = ((best_output - worst_output) / worst_output) * 100
             best_quote['savings_pct'] = savings_pct
@@ -254,15 +341,12 @@ class SmartOrderRouter:
         # Try splitting amount across top 2 DEXs
         split_amount = amount // 2
         
-        # Get fresh quotes for split amounts
-        split_quotes = []
-        for quote in quotes[:2]:  # Top 2 quotes
-            dex = self.dexs[quote['dex']]
-            split_quote = await self._get_quote_safe(
-                dex, input_mint, output_mint, split_amount, 100
-            )
-            if split_quote:
-                split_quotes.append(split_quote)
+        # Get fresh quotes for split amounts (Top 2 DEXs parallel)
+        results = await asyncio.gather(*[
+            self._get_quote_safe(self.dexs[quote['dex']], input_mint, output_mint, split_amount, 100)
+            for quote in quotes[:2]
+        ], return_exceptions=True)
+        split_quotes = [q for q in results if q and not isinstance(q, BaseException)]
                 
         if len(split_quotes) == 2:
             total_output = sum(q['outputAmount'] for q in split_quotes)
@@ -348,12 +432,30 @@ class MultiRegionRPC:
         self.health_status = {}
         self.current_best = None
         
+        # Eine langlebige Session für alle Probes - Keep-Alive statt neuem
+        # TCP+TLS Handshake pro Messung (misst die Latenz warmer Verbindungen)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._monitor_task: Optional[asyncio.Task] = None
+        
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get or create the shared probe session"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=64,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=60
+                ),
+                timeout=aiohttp.ClientTimeout(total=2)
+            )
+        return self._session
+        
     async def initialize(self):
         """Test all RPCs and determine best"""
         await self.test_all_rpcs()
         
         # Start monitoring task
-        asyncio.create_task(self._monitor_health())
+        self._monitor_task = asyncio.create_task(self._monitor_health())
         
     async def test_all_rpcs(self):
         """Test latency for all RPCs"""
@@ -374,31 +476,30 @@ class MultiRegionRPC:
     async def _test_rpc_latency(self, url: str, region: str) -> Dict:
         """Test single RPC latency"""
         try:
-            start = time.time()
+            session = await self._get_session()
+            payload = {
+                "jsonrpc": "2.0",
+                "id": 1,
+                "method": "getHealth"
+            }
             
-            async with aiohttp.ClientSession() as session:
-                payload = {
-                    "jsonrpc": "2.0",
-                    "id": 1,
-                    "method": "getHealth"
-                }
-                
-                async with session.post(url, json=payload, timeout=2) as response:
-                    if response.status == 200:
-                        latency = (time.time() - start) * 1000
-                        
-                        result = {
-                            'url': url,
-                            'region': region,
-                            'latency': latency,
-                            'healthy': True
-                        }
-                        
-                        self.latency_map[url] = latency
-                        self.health_status[url] = True
-                        
-                        return result
-                        
+            start = time.time()
+            async with session.post(url, json=payload) as response:
+                if response.status == 200:
+                    latency = (time.time() - start) * 1000
+                    
+                    result = {
+                        'url': url,
+                        'region': region,
+                        'latency': latency,
+                        'healthy': True
+                    }
+                    
+                    self.latency_map[url] = latency
+                    self.health_status[url] = True
+                    
+                    return result
+                    
         except Exception as e:
             self.health_status[url] = False
             return {'url': url, 'healthy': False}
@@ -421,6 +522,14 @@ class MultiRegionRPC:
         while True:
             await asyncio.sleep(30)  # Check every 30 seconds
             await self.test_all_rpcs()
+            
+    async def close(self):
+        """Stop monitoring and close the probe session"""
+        if self._monitor_task:
+            self._monitor_task.cancel()
+            self._monitor_task = None
+        if self._session and not self._session.closed:
+            await self._session.close()
 
 class SlippagePredictor:
     """
@@ -501,28 +610,78 @@ class SlippagePredictor:
             'timestamp': time.time()
         })
 
+# Shared HTTP Session für alle DEXs - ein Keep-Alive Pool + ein DNS Cache,
+# parallele Quotes an denselben Host nutzen bestehende Sockets wieder
+_shared_session: Optional[aiohttp.ClientSession] = None
+
+async def _get_shared_session() -> aiohttp.ClientSession:
+    """Get or create the shared DEX session"""
+    global _shared_session
+    if _shared_session is None or _shared_session.closed:
+        _shared_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=128,
+                limit_per_host=16,
+                ttl_dns_cache=300,
+                keepalive_timeout=75,
+                enable_cleanup_closed=True
+            ),
+            timeout=aiohttp.ClientTimeout(total=10)
+        )
+    return _shared_session
+
+async def close_shared_session():
+    """Close the shared DEX session"""
+    global _shared_session
+    if _shared_session and not _shared_session.closed:
+        await _shared_session.close()
+    _shared_session = None
+
 # DEX Implementations
 class JupiterDEX:
     """Jupiter DEX Integration"""
 
     def __init__(self):
         self.api_url = "https://quote-api.jup.ag/v6"
-        self.session: Optional[aiohttp.ClientSession] = None
 
-    async def _get_session(self) -> aiohttp.ClientSession:
-        """Get or create aiohttp session"""
-        if self.session is None or self.session.closed:
-            self.session = aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=10)
+        # Persistenter httpx Client - HTTP/2 multiplexed parallele Quotes
+        # über eine TCP/TLS Verbindung (Fallback: shared aiohttp Session)
+        self.client: Optional["httpx.AsyncClient"] = None
+        if HTTPX_AVAILABLE:
+            self.client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                base_url=self.api_url,
+                timeout=httpx.Timeout(3.0, connect=1.0),
+                limits=httpx.Limits(max_keepalive_connections=32, max_connections=64)
             )
-        return self.session
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Shared aiohttp session (ein Pool für alle DEXs)"""
+        return await _get_shared_session()
+
+    async def _request(self, method: str, path: str, **kwargs) -> Tuple[int, Any]:
+        """
+        HTTP Request gegen die Jupiter API
+
+        Returns:
+            (status, JSON body) bei 200, sonst (status, Text body)
+        """
+        if self.client is not None:
+            response = await self.client.request(method, path, **kwargs)
+            if response.status_code == 200:
+                return 200, response.json()
+            return response.status_code, response.text
+
+        session = await self._get_session()
+        async with session.request(method, f"{self.api_url}{path}", ssl=False, **kwargs) as response:
+            if response.status == 200:
+                return 200, await response.json()
+            return response.status, await response.text()
 
     async def get_quote(self, input_mint: str, output_mint: str,
                        amount: int, slippage_bps: int) -> Dict:
         """Get quote from Jupiter"""
         try:
-            session = await self._get_session()
-            url = f"{self.api_url}/quote"
             params = {
                 'inputMint': input_mint,
                 'outputMint': output_mint,
@@ -530,17 +689,16 @@ class JupiterDEX:
                 'slippageBps': slippage_bps
             }
 
-            async with session.get(url, params=params, ssl=False) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return {
-                        'dex': 'jupiter',
-                        'input_amount': amount,
-                        'output_amount': int(data.get('outAmount', 0)),
-                        'price_impact': float(data.get('priceImpactPct', 0)),
-                        'route': data.get('routePlan', []),
-                        'quote_response': data
-                    }
+            status, data = await self._request('GET', '/quote', params=params)
+            if status == 200:
+                return {
+                    'dex': 'jupiter',
+                    'input_amount': amount,
+                    'output_amount': int(data.get('outAmount', 0)),
+                    'price_impact': float(data.get('priceImpactPct', 0)),
+                    'route': data.get('routePlan', []),
+                    'quote_response': data
+                }
         except Exception as e:
             print(f"Jupiter quote error: {e}")
         return {}
@@ -557,10 +715,6 @@ class JupiterDEX:
             Transaction signature on success, empty string on failure
         """
         try:
-            session = await self._get_session()
-            # Jupiter swap API endpoint
-            swap_url = f"{self.api_url}/swap"
-
             swap_payload = {
                 'quoteResponse': quote.get('quote_response', {}),
                 'userPublicKey': str(keypair.pubkey()),
@@ -570,18 +724,16 @@ class JupiterDEX:
             }
 
             # Get swap transaction from Jupiter
-            async with session.post(swap_url, json=swap_payload, ssl=False) as response:
-                if response.status != 200:
-                    error_text = await response.text()
-                    print(f"❌ Jupiter swap API error ({response.status}): {error_text}")
-                    return ""
+            status, swap_data = await self._request('POST', '/swap', json=swap_payload)
+            if status != 200:
+                print(f"❌ Jupiter swap API error ({status}): {swap_data}")
+                return ""
 
-                swap_data = await response.json()
-                swap_tx_base64 = swap_data.get('swapTransaction')
+            swap_tx_base64 = swap_data.get('swapTransaction')
 
-                if not swap_tx_base64:
-                    print(f"❌ No swap transaction returned from Jupiter")
-                    return ""
+            if not swap_tx_base64:
+                print(f"❌ No swap transaction returned from Jupiter")
+                return ""
 
             # Decode the transaction
             tx_bytes = base64.b64decode(swap_tx_base64)
@@ -625,24 +777,19 @@ class JupiterDEX:
         return ""
 
     async def close(self):
-        """Close session"""
-        if self.session and not self.session.closed:
-            await self.session.close()
+        """Close httpx client"""
+        if self.client is not None:
+            await self.client.aclose()
 
 class RaydiumDEX:
     """Raydium DEX Integration"""
 
     def __init__(self):
         self.api_url = "https://api.raydium.io/v2"
-        self.session: Optional[aiohttp.ClientSession] = None
 
     async def _get_session(self) -> aiohttp.ClientSession:
-        """Get or create aiohttp session"""
-        if self.session is None or self.session.closed:
-            self.session = aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=10)
-            )
-        return self.session
+        """Shared aiohttp session (ein Pool für alle DEXs)"""
+        return await _get_shared_session()
 
     async def get_quote(self, input_mint: str, output_mint: str,
                        amount: int, slippage_bps: int) -> Dict:
@@ -683,25 +830,15 @@ class RaydiumDEX:
             print(f"Raydium swap error: {e}")
         return ""
 
-    async def close(self):
-        """Close session"""
-        if self.session and not self.session.closed:
-            await self.session.close()
-
 class OrcaDEX:
     """Orca DEX Integration"""
 
     def __init__(self):
         self.api_url = "https://api.orca.so"
-        self.session: Optional[aiohttp.ClientSession] = None
 
     async def _get_session(self) -> aiohttp.ClientSession:
-        """Get or create aiohttp session"""
-        if self.session is None or self.session.closed:
-            self.session = aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=10)
-            )
-        return self.session
+        """Shared aiohttp session (ein Pool für alle DEXs)"""
+        return await _get_shared_session()
 
     async def get_quote(self, input_mint: str, output_mint: str,
                        amount: int, slippage_bps: int) -> Dict:
@@ -741,26 +878,15 @@ class OrcaDEX:
             print(f"Orca swap error: {e}")
         return ""
 
-    async def close(self):
-        """Close session"""
-        if self.session and not self.session.closed:
-            await self.session.close()
-
 class SerumDEX:
     """Serum DEX Integration"""
 
-    def __init__(self):
-        # Serum is now mostly deprecated in favor of OpenBook
-        # But keeping for compatibility
-        self.session: Optional[aiohttp.ClientSession] = None
+    # Serum is now mostly deprecated in favor of OpenBook
+    # But keeping for compatibility
 
     async def _get_session(self) -> aiohttp.ClientSession:
-        """Get or create aiohttp session"""
-        if self.session is None or self.session.closed:
-            self.session = aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=10)
-            )
-        return self.session
+        """Shared aiohttp session (ein Pool für alle DEXs)"""
+        return await _get_shared_session()
 
     async def get_quote(self, input_mint: str, output_mint: str,
                        amount: int, slippage_bps: int) -> Dict:
@@ -784,11 +910,6 @@ class SerumDEX:
             print(f"Serum swap error: {e}")
         return ""
 
-    async def close(self):
-        """Close session"""
-        if self.session and not self.session.closed:
-            await self.session.close()
-
 # Global Instances
 smart_router = SmartOrderRouter()
 multi_rpc = MultiRegionRPC()
@@ -872,6 +993,86 @@ class Trader:
         self.winning_trades: int = 0
         self.is_initialized = False
 
+        # Listener für geschlossene Trades (z.B. Telegram Statistik)
+        self.trade_listeners: List[Callable[[Dict], None]] = []
+
+        # Structure-of-Arrays Spiegel der offenen Positionen (für Portfolio-Aggregate)
+        self._slot_capacity = 64
+        self._entry = np.empty(self._slot_capacity, dtype=np.float64)
+        self._current = np.empty(self._slot_capacity, dtype=np.float64)
+        self._amount = np.empty(self._slot_capacity, dtype=np.float64)
+        self._slot_of: Dict[str, int] = {}
+        self._slot_addrs: List[str] = []
+        self._slot_symbols: List[str] = []
+
+    def _track_position(self, position: Position):
+        """Position in die SoA Arrays aufnehmen (append, bei Bedarf verdoppeln).
+        Ein bereits getrackter Token überschreibt seinen Slot, wie self.positions[addr]"""
+        slot = self._slot_of.get(position.token_address)
+        if slot is not None:
+            self._entry[slot] = position.entry_price
+            self._current[slot] = position.current_price
+            self._amount[slot] = position.amount_sol
+            self._slot_symbols[slot] = position.symbol
+            return
+
+        slot = len(self._slot_addrs)
+        if slot == self._slot_capacity:
+            self._slot_capacity *= 2
+            self._entry = np.resize(self._entry, self._slot_capacity)
+            self._current = np.resize(self._current, self._slot_capacity)
+            self._amount = np.resize(self._amount, self._slot_capacity)
+
+        self._entry[slot] = position.entry_price
+        self._current[slot] = position.current_price
+        self._amount[slot] = position.amount_sol
+        self._slot_of[position.token_address] = slot
+        self._slot_addrs.append(position.token_address)
+        self._slot_symbols.append(position.symbol)
+
+    def _untrack_position(self, token_address: str):
+        """Position aus den SoA Arrays entfernen (swap-pop, O(1))"""
+        slot = self._slot_of.pop(token_address, None)
+        if slot is None:
+            return
+
+        last = len(self._slot_addrs) - 1
+        if slot != last:
+            moved = self._slot_addrs[last]
+            self._entry[slot] = self._entry[last]
+            self._current[slot] = self._current[last]
+            self._amount[slot] = self._amount[last]
+            self._slot_addrs[slot] = moved
+            self._slot_symbols[slot] = self._slot_symbols[last]
+            self._slot_of[moved] = slot
+        self._slot_addrs.pop()
+        self._slot_symbols.pop()
+
+    def get_portfolio_summary(self) -> Tuple[Tuple[str, ...], np.ndarray, float, float]:
+        """
+        Vektorisierte Portfolio-Aggregate über alle offenen Positionen
+
+        Konsistenter Snapshot: alle Werte sind Kopien, spätere Änderungen an
+        den Positionen wirken sich nicht auf das Ergebnis aus.
+
+        Returns:
+            (symbols, profit_pct, total_invested, total_current_value)
+        """
+        n = len(self._slot_addrs)
+        entry = self._entry[:n]
+        current = self._current[:n]
+        amount = self._amount[:n]
+
+        # Ohne aktuellen Preis zählt die Position mit 0% (wie bisher)
+        valid = (current > 0) & (entry > 0)
+        profit_pct = np.zeros(n)
+        np.divide(current - entry, entry, out=profit_pct, where=valid)
+        profit_pct *= 100
+
+        total_invested = float(amount.sum())
+        total_current_value = float(np.dot(amount, 1 + profit_pct / 100))
+        return tuple(self._slot_symbols), profit_pct, total_invested, total_current_value
+
     async def initialize(self, keypair=None):
         """
         Initialize trader with keypair
@@ -953,6 +1154,7 @@ class Trader:
 
             if tx_signature:
                 self.positions[token_metrics.address] = position
+                self._track_position(position)
                 print(f"✅ Opened position in {token_metrics.symbol}")
                 print(f"   Entry: ${entry_price:.8f}")
                 print(f"   Amount: {amount_sol} SOL")
@@ -1014,7 +1216,7 @@ class Trader:
                 self.win_rate = (self.winning_trades / self.total_trades) * 100 if self.total_trades > 0 else 0
 
                 # Record trade
-                self.trade_history.append({
+                trade = {
                     'symbol': position.symbol,
                     'entry_price': position.entry_price,
                     'exit_price': position.current_price,
@@ -1025,7 +1227,8 @@ class Trader:
                     'pnl': pnl,
                     'pnl_pct': pnl_pct,
                     'reason': reason
-                })
+                }
+                self.trade_history.append(trade)
 
                 print(f"✅ Closed position in {position.symbol}")
                 print(f"   Reason: {reason}")
@@ -1033,6 +1236,15 @@ class Trader:
 
                 # Remove from active positions
                 del self.positions[token_address]
+                self._untrack_position(token_address)
+
+                # Listener erst nach dem Aufräumen - ein fehlerhafter Listener darf
+                # weder die anderen blockieren noch den Verkauf als gescheitert melden
+                for listener in self.trade_listeners:
+                    try:
+                        listener(trade)
+                    except Exception as e:
+                        print(f"Trade Listener Error: {e}")
                 return True
             else:
                 print(f"❌ Failed to execute sell for {position.symbol}")
@@ -1051,6 +1263,9 @@ class Trader:
                 current_price = position.current_price  # Placeholder
 
                 position.update_pnl(current_price)
+                slot = self._slot_of.get(token_address)
+                if slot is not None:
+                    self._current[slot] = current_price
 
                 # Check stop loss
                 if position.should_stop_loss():
@@ -1074,6 +1289,12 @@ class Trader:
         """Returns list of active positions"""
         return list(self.positions.values())
 
+    async def cleanup(self):
+        """Release network resources (called on bot shutdown)"""
+        await multi_rpc.close()
+        await smart_router.dexs['jupiter'].close()
+        await close_shared_session()
+
     def get_stats(self) -> Dict:
         """Returns trading statistics"""
         return {